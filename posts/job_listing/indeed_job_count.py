@@ -1,35 +1,63 @@
-# need to wrap to function
-# fill key works, must include, loop by colation: state or city, output name
-from selenium.webdriver.common.by import By
-from selenium import webdriver
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import numpy as np
-import pandas as pd
-from selenium.webdriver.chrome.options import Options
-from datetime import datetime
-
-
-options = webdriver.ChromeOptions()
-# options.add_argument('headless')
-options.add_argument('window-size=1920x1080')
-options.add_argument("disable-gpu")
-driver = webdriver.Chrome('./chromedriver', chrome_options=options)
+# Count Indeed job postings for a keyword in every state.
+# Run serially with one driver (default) or spread the states over a worker
+# pool of drivers sharing one rate limit: python indeed_job_count.py --workers 4
+#
+# --mode direct (default) requests the results URL and reads the count from the
+# HTML, starting a browser only when the plain request is blocked. --mode form
+# drives the advanced-search form as before. --base-url points either mode at a
+# local stand-in server for testing.
+import argparse
+import re
+import sys
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from datetime import date
+from pathlib import Path
+from urllib.parse import urlencode
+
+from job_count_store import DEFAULT_STORE, JobCountStore
+
+# The browser runtime is shared with the course scrapers from <repo>/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'shared'))
+from scraping_runtime import DriverConfig, DriverPool, RateLimiter, RunMetrics, retry  # noqa: E402
 
 
 state_names=["Alabama", "Alaska", "Arizona", "Arkansas", "California", "Colorado", "Connecticut", "Delaware", "Florida", "Georgia", "Hawaii", "Idaho", "Illinois", "Indiana", "Iowa", "Kansas", "Kentucky", "Louisiana", "Maine", "Maryland", "Massachusetts", "Michigan", "Minnesota", "Mississippi", "Missouri", "Montana", "Nebraska", "Nevada", "New Hampshire", "New Jersey", "New Mexico", "New York", "North Carolina", "North Dakota", "Ohio", "Oklahoma", "Oregon", "Pennsylvania", "Rhode Island", "South Carolina", "South Dakota", "Tennessee", "Texas", "Utah", "Vermont", "Virginia", "Washington", "West Virginia", "Wisconsin", "Wyoming"]
-dates = []
-job_counts = []
 
-for state in state_names:
-    driver.get("https://www.indeed.com/advanced_search")
+INDEED_URL = 'https://www.indeed.com'
+KEYWORD = 'analytics'
+FROMAGE = 'any'  # result age: any time
+RADIUS = 0       # location: only in
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+PAGE_TIMEOUT = 10       # seconds to wait for the form / result count to appear
+MIN_REQUEST_INTERVAL = 2.0  # seconds between searches across *all* workers
+MAX_RETRIES = 2
+STATE_CSV = Path(__file__).parent / 'post_count_state.csv'  # read by visual_job_listing.js
+
+
+# Browsers come from the shared runtime; selenium is only imported when a
+# driver is actually started, so direct mode never loads it unless blocked.
+# Headless by default; --headed shows the windows to debug challenge pages
+DRIVER_CONFIG = DriverConfig(implicit_wait=0)
+
+
+def sub_str(s, start, end):
+    return s[s.find(start)+len(start):s.rfind(end)]
 
-    driver.implicitly_wait(3)
+
+def fetch_state_count(driver, state, keyword=KEYWORD, base_url=INDEED_URL):
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    driver.get(f"{base_url}/advanced_search")
+    wait = WebDriverWait(driver, PAGE_TIMEOUT)
 
     # search analyst
-    search_job = driver.find_element('xpath','//input[@id="as_and"]')
-    search_job.send_keys(['analytics'])
+    search_job = wait.until(lambda d: d.find_element('xpath', '//input[@id="as_and"]'))
+    search_job.send_keys([keyword])
 
     # search location
     searchLocation = driver.find_element('xpath','//input[@id="where"]')
@@ -37,7 +65,6 @@ for state in state_names:
     # searchLocation.send_keys("united states")
     searchLocation.send_keys(state)
 
-
     # limited to all the time
     result_age = driver.find_element(
         'xpath',
@@ -50,33 +77,197 @@ for state in state_names:
         '//select[@id="radius"]//option[@value="0"]')
     result_age.click()
 
-    driver.implicitly_wait(3)
-
     # push search button
     search_button = driver.find_element('xpath','//*[@id="fj"]')
     search_button.click()
-    driver.implicitly_wait(3)
 
-    # Get exact search result amount
-    search_count = driver.find_element(
+    # Get exact search result amount (wait for it rather than sleeping)
+    search_count = wait.until(lambda d: d.find_element(
         'xpath',
         "//div[contains(@class,'jobCount')]"
-        ).text
+        )).text
     print(state, search_count)
-    def sub_str(s, start, end):
-        return s[s.find(start)+len(start):s.rfind(end)]
-    num = sub_str(search_count, "of ", " jobs")
-    job_counts.append(num)
+    return sub_str(search_count, "of ", " jobs")
+
+
+# Count text as rendered ("Page 1 of 1,234 jobs" / "1,234 jobs") or embedded in
+# the page's JSON state
+JOB_COUNT_PATTERNS = [
+    re.compile(r'jobCount[^>]*>(?:\s*<[^>]+>)*\s*(?:Page \d+ of )?([\d,]+)\+?\s*jobs', re.I),
+    re.compile(r'"(?:totalJobCount|jobCount)"\s*:\s*"?([\d,]+)'),
+]
+NO_RESULTS_MARKERS = ('did not match any jobs', 'no jobs found')
+BLOCKED_MARKERS = ('captcha', 'cf-chl', 'just a moment', 'request blocked')  # matched lower-cased
+BLOCKED_STATUS = {403, 429, 503}
+
+
+class Blocked(Exception):
+    """The plain HTTP request was refused or challenged."""
+
+
+def results_url(state, keyword=KEYWORD, fromage=FROMAGE, radius=RADIUS, base_url=INDEED_URL):
+    return f"{base_url}/jobs?" + urlencode({'q': keyword, 'l': state, 'fromage': fromage, 'radius': radius})
+
+
+def parse_job_count(html):
+    for pattern in JOB_COUNT_PATTERNS:
+        match = pattern.search(html)
+        if match:
+            return match.group(1).replace(',', '')
+    lowered = html.lower()
+    if any(marker in lowered for marker in NO_RESULTS_MARKERS):
+        return '0'
+    return None
+
+
+def is_blocked_page(html):
+    lowered = html.lower()
+    return any(marker in lowered for marker in BLOCKED_MARKERS)
+
+
+def http_get(url, timeout=PAGE_TIMEOUT):
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT, 'Accept-Language': 'en-US,en'})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.read().decode('utf-8', errors='replace')
+    except urllib.error.HTTPError as e:
+        if e.code in BLOCKED_STATUS:
+            raise Blocked(f"HTTP {e.code}") from e
+        raise
+
+
+def fetch_direct_count(state, keyword=KEYWORD, base_url=INDEED_URL, get_driver=None):
+    """One GET for the results page; a browser load of the same URL only if blocked."""
+    url = results_url(state, keyword, base_url=base_url)
+    try:
+        html = http_get(url)
+        count = parse_job_count(html)
+        if count is not None:
+            print(state, count, '(direct)')
+            return count
+        if not is_blocked_page(html):
+            raise ValueError(f"no job count found at {url}")
+    except Blocked as e:
+        print(f"{state}: direct request blocked ({e})")
+    if get_driver is None:
+        raise Blocked(f"{state}: blocked and no browser fallback")
+
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    driver = get_driver()
+    driver.get(url)
+    search_count = WebDriverWait(driver, PAGE_TIMEOUT).until(lambda d: d.find_element(
+        'xpath',
+        "//div[contains(@class,'jobCount')]"
+        )).text
+    print(state, search_count, '(browser)')
+    return parse_job_count(f'<div class="jobCount">{search_count}</div>') or sub_str(search_count, "of ", " jobs")
+
+
+class BudgetExhausted(Exception):
+    """No requests left in this run's budget."""
+
+
+class RequestBudget:
+    """Cap on total search requests for a run (None = unlimited), shared by all workers."""
+
+    def __init__(self, limit=None):
+        self.remaining = limit
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            if self.remaining is None:
+                return True
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+def sweep_cells(cells, workers=1, interval=MIN_REQUEST_INTERVAL, retries=MAX_RETRIES,
+                mode='direct', base_url=INDEED_URL, budget=None, on_result=None, headed=False):
+    """Fetch [(keyword, location)] cells; return [(date, keyword, location, count)] in input order.
+
+    `budget` (a RequestBudget) bounds the number of requests; cells left when it runs
+    out come back with count None. `on_result` is called from the worker as each cell
+    finishes so long runs can persist incrementally. `headed` opens visible browsers.
+    """
+    limiter = RateLimiter(interval)
+    budget = budget or RequestBudget()
+    metrics = RunMetrics()
+    pool = DriverPool(replace(DRIVER_CONFIG, headless=not headed), size=workers, metrics=metrics)
+
+    def attempt(keyword, location):
+        if not budget.take():
+            raise BudgetExhausted()
+        limiter.wait()
+        with pool.lease() as lease, metrics.timed('fetch'):
+            try:
+                if mode == 'direct':
+                    return fetch_direct_count(location, keyword, base_url, get_driver=lease.get)
+                return fetch_state_count(lease.get(), location, keyword, base_url)
+            except Exception:
+                # A fresh browser is the cheapest way out of a wedged page
+                lease.discard()
+                raise
+
+    def task(cell):
+        keyword, location = cell
+        try:
+            count = retry(lambda: attempt(keyword, location), attempts=retries + 1,
+                          stop_on=(BudgetExhausted,), metrics=metrics,
+                          on_error=lambda n, e: print(f"{location}: attempt {n} failed ({e})"))
+        except Exception:
+            count = None
+        result = (date.today().isoformat(), keyword, location, count)
+        if on_result is not None and count is not None:
+            on_result(result)
+        return result
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool_threads:
+            # map() yields in submission order, so output order is deterministic
+            return list(pool_threads.map(task, cells))
+    finally:
+        pool.close()
+        metrics.report()
+
+
+def sweep(states, workers=1, interval=MIN_REQUEST_INTERVAL, retries=MAX_RETRIES, keyword=KEYWORD,
+          mode='direct', base_url=INDEED_URL, headed=False):
+    """Return [(date, state, count)] in the order of `states`; date is ISO, count a string or None."""
+    results = sweep_cells([(keyword, state) for state in states], workers, interval, retries, mode, base_url,
+                          headed=headed)
+    return [(day, state, count) for day, _, state, count in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Count Indeed job postings by state")
+    parser.add_argument('--keyword', default=KEYWORD)
+    parser.add_argument('--workers', type=int, default=1, help="parallel browser drivers")
+    parser.add_argument('--interval', type=float, default=MIN_REQUEST_INTERVAL,
+                        help="minimum seconds between searches across all workers")
+    parser.add_argument('--retries', type=int, default=MAX_RETRIES)
+    parser.add_argument('--mode', choices=['direct', 'form'], default='direct',
+                        help="direct: fetch the results URL (browser only when blocked); form: fill the search form")
+    parser.add_argument('--base-url', default=INDEED_URL, help="e.g. a local stand-in server for testing")
+    parser.add_argument('--store', default=str(DEFAULT_STORE), help="SQLite time-series store")
+    parser.add_argument('--csv', default=str(STATE_CSV), help="latest count per state, read by the map")
+    parser.add_argument('--headed', action='store_true', help="show the browser windows (debug challenge pages)")
+    args = parser.parse_args()
 
-    date = datetime.now().strftime("%m/%d/%Y")
-    dates.append(date)
+    results = sweep(state_names, args.workers, args.interval, args.retries, args.keyword,
+                    args.mode, args.base_url.rstrip('/'), args.headed)
 
-df = pd.DataFrame()
-df['date'] = dates
-df['state'] = state_names
-df['count'] = job_counts
+    # Append this sweep to the time series (integer counts keyed by date/keyword/location)
+    with JobCountStore(args.store) as store:
+        store.record((day, args.keyword, state, count) for day, state, count in results)
+        rollup = store.national_rollup(args.keyword, start=date.today(), end=date.today())
+        store.export_csv(args.csv, args.keyword, state_names)
+    for day, total, reporting in rollup:
+        print(f"{day}: {total} '{args.keyword}' jobs across {reporting} locations")
 
-filename = datetime.now().strftime("ost_count_state.csv")
-df.reset_index().to_csv(filename)
 
-driver.quit()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# Time-series store for job counts: one row per (date, keyword, location) with
+# an integer count, kept in a single SQLite file instead of one CSV per run.
+import csv
+import re
+import sqlite3
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+
+DEFAULT_STORE = Path(__file__).parent / 'job_counts.sqlite'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS job_counts (
+    date     TEXT    NOT NULL,  -- ISO YYYY-MM-DD
+    keyword  TEXT    NOT NULL,
+    location TEXT    NOT NULL,
+    count    INTEGER,
+    PRIMARY KEY (date, keyword, location)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS job_counts_series ON job_counts (keyword, location, date);
+"""
+
+
+def parse_count(value):
+    """'1,234' / '1234+' / 1234 -> 1234; anything without digits -> None."""
+    if value is None:
+        return None
+    if isinstance(value, int):
+        return value
+    digits = re.sub(r'[^\d]', '', str(value))
+    return int(digits) if digits else None
+
+
+def _iso(day):
+    return day.isoformat() if isinstance(day, date) else str(day)
+
+
+class JobCountStore:
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = str(path)
+        # Shared by sweep worker threads; writes are serialized by the lock
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, rows):
+        """Upsert (date, keyword, location, count) rows; re-running a day overwrites it,
+        except that a missing count never replaces one already collected."""
+        rows = [(_iso(d), keyword, location, parse_count(count)) for d, keyword, location, count in rows]
+        with self.lock, self.conn:
+            self.conn.executemany("""
+                INSERT INTO job_counts (date, keyword, location, count) VALUES (?, ?, ?, ?)
+                ON CONFLICT (date, keyword, location) DO UPDATE SET count = COALESCE(excluded.count, count)
+            """, rows)
+
+    def collected(self, day=None):
+        """{(keyword, location)} already stored with a count for `day` (default today)."""
+        with self.lock:
+            cur = self.conn.execute(
+                "SELECT keyword, location FROM job_counts WHERE date = ? AND count IS NOT NULL",
+                (_iso(day or date.today()),))
+            return set(cur.fetchall())
+
+    def series(self, keyword, location):
+        cur = self.conn.execute(
+            "SELECT date, count FROM job_counts WHERE keyword = ? AND location = ? ORDER BY date",
+            (keyword, location))
+        return cur.fetchall()
+
+    def week_over_week(self, keyword, as_of=None):
+        """[(location, count, count_week_ago, change)] using the latest sample on or
+        before `as_of` and on or before seven days earlier."""
+        as_of = as_of or date.today()
+        week_ago = as_of - timedelta(days=7)
+        cur = self.conn.execute("""
+            WITH latest AS (
+                SELECT location, MAX(date) AS d FROM job_counts
+                WHERE keyword = :kw AND date <= :now AND count IS NOT NULL GROUP BY location
+            ), prior AS (
+                SELECT location, MAX(date) AS d FROM job_counts
+                WHERE keyword = :kw AND date <= :prev AND count IS NOT NULL GROUP BY location
+            )
+            SELECT l.location, cur.count, old.count, cur.count - old.count
+            FROM latest l
+            JOIN job_counts cur ON cur.keyword = :kw AND cur.location = l.location AND cur.date = l.d
+            LEFT JOIN prior p ON p.location = l.location
+            LEFT JOIN job_counts old ON old.keyword = :kw AND old.location = p.location AND old.date = p.d
+            ORDER BY l.location
+        """, {'kw': keyword, 'now': _iso(as_of), 'prev': _iso(week_ago)})
+        return cur.fetchall()
+
+    def national_rollup(self, keyword, start=None, end=None):
+        """[(date, total_count, locations_reporting)] per sweep date."""
+        cur = self.conn.execute("""
+            SELECT date, SUM(count), COUNT(count) FROM job_counts
+            WHERE keyword = ? AND date BETWEEN ? AND ?
+            GROUP BY date ORDER BY date
+        """, (keyword, _iso(start or '0000-01-01'), _iso(end or '9999-12-31')))
+        return cur.fetchall()
+
+    def latest(self, keyword, locations=None):
+        """[(date, location, count)] with the most recent collected count per location."""
+        cur = self.conn.execute("""
+            SELECT c.date, c.location, c.count FROM job_counts c
+            JOIN (SELECT location, MAX(date) AS d FROM job_counts
+                  WHERE keyword = ? AND count IS NOT NULL GROUP BY location) l
+              ON c.location = l.location AND c.date = l.d
+            WHERE c.keyword = ? ORDER BY c.location
+        """, (keyword, keyword))
+        rows = cur.fetchall()
+        if locations is not None:
+            wanted = set(locations)
+            rows = [row for row in rows if row[1] in wanted]
+        return rows
+
+    def export_csv(self, path, keyword, locations=None):
+        """Write the latest count per location in the date,state,count layout the map reads."""
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['date', 'state', 'count'])
+            for day, location, count in self.latest(keyword, locations):
+                writer.writerow([date.fromisoformat(day).strftime('%m/%d/%Y'), location, count])
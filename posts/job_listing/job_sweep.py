@@ -0,0 +1,91 @@
+# Keyword x location sweep for job counts.
+# Builds a deduplicated plan from a matrix of keywords and locations (states,
+# metros, cities), skips cells already collected today, and runs the rest with
+# bounded concurrency under a shared rate limit and a total request budget:
+#
+#   python job_sweep.py --keywords analytics "data science" --states \
+#       --metros "Columbus, OH" "Chicago, IL" --workers 4 --budget 2000
+import argparse
+from datetime import date
+
+from indeed_job_count import (INDEED_URL, MAX_RETRIES, MIN_REQUEST_INTERVAL, RequestBudget,
+                              state_names, sweep_cells)
+from job_count_store import DEFAULT_STORE, JobCountStore
+
+
+def _normalize(text):
+    return ' '.join(text.split())
+
+
+def read_locations(path):
+    """One location per line; blank lines and # comments ignored."""
+    with open(path, encoding='utf-8') as f:
+        return [line.split('#')[0].strip() for line in f if line.split('#')[0].strip()]
+
+
+def build_plan(keywords, locations, done=()):
+    """[(keyword, location)] for every matrix cell, deduplicated case-insensitively
+    (first spelling wins) and minus the cells in `done`."""
+    done = {(k.casefold(), l.casefold()) for k, l in done}
+    seen = set()
+    plan = []
+    for keyword in keywords:
+        keyword = _normalize(keyword)
+        for location in locations:
+            location = _normalize(location)
+            key = (keyword.casefold(), location.casefold())
+            if not keyword or not location or key in seen or key in done:
+                continue
+            seen.add(key)
+            plan.append((keyword, location))
+    return plan
+
+
+def run_sweep(keywords, locations, store, workers=1, interval=MIN_REQUEST_INTERVAL,
+              retries=MAX_RETRIES, budget=None, mode='direct', base_url=INDEED_URL, headed=False):
+    plan = build_plan(keywords, locations, store.collected(date.today()))
+    print(f"{len(plan)} cells to fetch ({len(keywords)} keywords x {len(locations)} locations, "
+          f"already-collected cells skipped)")
+    if not plan:
+        return []
+    # Each finished cell is stored immediately, so a rerun after an interruption
+    # or an exhausted budget picks up where this one stopped
+    results = sweep_cells(plan, workers, interval, retries, mode, base_url,
+                          budget=RequestBudget(budget), on_result=lambda row: store.record([row]), headed=headed)
+    missing = sum(1 for row in results if row[3] is None)
+    print(f"fetched {len(results) - missing}/{len(results)} cells"
+          + (f", {missing} left for the next run" if missing else ""))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep job counts over a keyword x location matrix")
+    parser.add_argument('--keywords', nargs='+', default=['analytics'])
+    parser.add_argument('--states', action='store_true', help="include all 50 states")
+    parser.add_argument('--metros', nargs='*', default=[])
+    parser.add_argument('--cities', nargs='*', default=[])
+    parser.add_argument('--locations-file', help="extra locations, one per line")
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--interval', type=float, default=MIN_REQUEST_INTERVAL,
+                        help="minimum seconds between requests across all workers")
+    parser.add_argument('--retries', type=int, default=MAX_RETRIES)
+    parser.add_argument('--budget', type=int, default=None, help="max requests this run")
+    parser.add_argument('--mode', choices=['direct', 'form'], default='direct')
+    parser.add_argument('--base-url', default=INDEED_URL)
+    parser.add_argument('--store', default=str(DEFAULT_STORE))
+    parser.add_argument('--headed', action='store_true', help="show the browser windows (debug challenge pages)")
+    args = parser.parse_args()
+
+    locations = (state_names if args.states else []) + args.metros + args.cities
+    if args.locations_file:
+        locations += read_locations(args.locations_file)
+    if not locations:
+        parser.error("no locations: pass --states, --metros, --cities or --locations-file")
+
+    with JobCountStore(args.store) as store:
+        run_sweep(args.keywords, locations, store, args.workers, args.interval, args.retries,
+                  args.budget, args.mode, args.base_url.rstrip('/'), args.headed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# Local stand-in server checks for the direct Indeed fetch (--base-url):
+# python -m unittest test_indeed_job_count
+import importlib.util
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import indeed_job_count as jobs
+
+# location -> (status, body) served by the stand-in
+PAGES = {
+    'Ohio': (200, '<div class="jobCountDiv"><span>Page 1 of 1,234 jobs</span></div>'),
+    'Utah': (200, '<script>window.state = {"totalJobCount": 87}</script>'),
+    'Iowa': (200, '<p>The search analytics did not match any jobs.</p>'),
+    'Texas': (200, '<title>Just a moment...</title><div>Please complete the CAPTCHA</div>'),
+    'Maine': (429, 'Too Many Requests'),
+    'Idaho': (200, '<html>unrelated page</html>'),
+}
+
+
+HAS_SELENIUM = importlib.util.find_spec('selenium') is not None
+
+
+class FakeDriver:
+    """Browser stand-in whose rendered page always shows `count_text`."""
+
+    def __init__(self, count_text):
+        self.count_text = count_text
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def find_element(self, by, value):
+        return type('Element', (), {'text': self.count_text})()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        location = parse_qs(urlparse(self.path).query).get('l', [''])[0]
+        status, body = PAGES.get(location, (404, 'not found'))
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.end_headers()
+        self.wfile.write(body.encode('utf-8'))
+
+    def log_message(self, *args):
+        pass
+
+
+class ParseJobCountTest(unittest.TestCase):
+    def test_rendered_count(self):
+        self.assertEqual(jobs.parse_job_count(PAGES['Ohio'][1]), '1234')
+
+    def test_embedded_json_count(self):
+        self.assertEqual(jobs.parse_job_count(PAGES['Utah'][1]), '87')
+
+    def test_no_results(self):
+        self.assertEqual(jobs.parse_job_count(PAGES['Iowa'][1]), '0')
+
+    def test_blocked_markers_ignore_case(self):
+        self.assertTrue(jobs.is_blocked_page(PAGES['Texas'][1]))
+        self.assertTrue(jobs.is_blocked_page('<h1>Request BLOCKED</h1>'))
+        self.assertFalse(jobs.is_blocked_page(PAGES['Idaho'][1]))
+
+
+class DirectFetchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), StandInHandler)
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_port}'
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def fetch(self, state, get_driver=None):
+        return jobs.fetch_direct_count(state, 'analytics', self.base_url, get_driver=get_driver)
+
+    def test_counts_from_stand_in(self):
+        self.assertEqual(self.fetch('Ohio'), '1234')
+        self.assertEqual(self.fetch('Utah'), '87')
+        self.assertEqual(self.fetch('Iowa'), '0')
+
+    def assert_browser_count(self, state):
+        driver = FakeDriver('Page 1 of 4,321 jobs')
+        self.assertEqual(self.fetch(state, get_driver=lambda: driver), '4321')
+        self.assertEqual(len(driver.visited), 1)
+        self.assertEqual(parse_qs(urlparse(driver.visited[0]).query)['l'], [state])
+
+    @unittest.skipUnless(HAS_SELENIUM, "selenium not installed")
+    def test_challenge_page_falls_back_to_browser(self):
+        self.assert_browser_count('Texas')
+
+    @unittest.skipUnless(HAS_SELENIUM, "selenium not installed")
+    def test_blocked_status_falls_back_to_browser(self):
+        self.assert_browser_count('Maine')
+
+    def test_blocked_without_browser_raises(self):
+        for state in ('Texas', 'Maine'):
+            with self.assertRaises(jobs.Blocked):
+                self.fetch(state)
+
+    def test_unrecognized_page_is_an_error_not_a_block(self):
+        with self.assertRaises(ValueError):
+            self.fetch('Idaho')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,22 +1,199 @@
-from pathlib import Path
+from shiny import App, reactive, render, ui
 
-import pandas
-from shiny import App, render, ui
+from courses_data import COURSE_DATA, COURSE_COLUMN, MODE_COLUMN, TERM_COLUMN
+
+# How often each session checks the CSV's mtime/size for changes (seconds)
+POLL_INTERVAL = 5
+
+# Rows per batch sent to the browser, and the most a single request may ask for
+BATCH_SIZE = 100
+MAX_BATCH_SIZE = 500
+
+DISPLAY_COLUMNS = [
+    COURSE_COLUMN,
+    "Session_Code",
+    "Course_Name",
+    TERM_COLUMN,
+    "Enrolled_Seats",
+    "Total_Seats",
+    "Waitlist",
+    "Weekdays",
+    "Class_Times",
+    "Locations",
+    "Instructors",
+    MODE_COLUMN,
+]
+
+SORT_CHOICES = {
+    "": "(file order)",
+    COURSE_COLUMN: "Course",
+    "Session_Code": "Section",
+    TERM_COLUMN: "Term",
+    MODE_COLUMN: "Mode",
+    "Enrolled_Seats": "Enrolled",
+    "Total_Seats": "Capacity",
+    "Waitlist": "Waitlist",
+}
+
+# Virtualized table: the scroll container is sized for every row, but only the
+# rows in view (plus a small overscan) are ever requested from the server.
+VIRTUAL_TABLE_CSS = """
+#course_grid { height: 70vh; overflow-y: auto; position: relative; border: 1px solid #e5e7eb; }
+#course_grid .spacer { position: relative; }
+#course_grid table { position: absolute; top: 0; left: 0; width: 100%; border-collapse: collapse; font-size: 0.9rem; }
+#course_grid th { position: sticky; top: 0; background: #1e40af; color: white; text-align: left; padding: 0 0.5rem; }
+#course_grid td, #course_grid th { height: 32px; white-space: nowrap; padding: 0 0.5rem; }
+#course_grid tbody tr:nth-child(even) { background: #f9fafb; }
+"""
+
+VIRTUAL_TABLE_JS = """
+(function() {
+  var ROW_HEIGHT = 32, OVERSCAN = 20;
+  var state = { total: 0, columns: [], query: 0, start: 0, rows: [], pending: null };
+
+  function grid() { return document.getElementById('course_grid'); }
+
+  var ESCAPES = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;' };
+  function esc(v) {
+    return v === null || v === undefined ? '' : String(v).replace(/[&<>"']/g, function(c) { return ESCAPES[c]; });
+  }
+
+  function requestWindow(start, count) {
+    var key = state.query + ':' + start;
+    if (state.pending === key) return;
+    state.pending = key;
+    Shiny.setInputValue('table_window',
+      { query: state.query, start: start, count: count }, { priority: 'event' });
+  }
+
+  function render() {
+    var el = grid();
+    if (!el) return;
+    var first = Math.floor(el.scrollTop / ROW_HEIGHT);
+    var visible = Math.ceil(el.clientHeight / ROW_HEIGHT);
+    var want = Math.max(0, first - OVERSCAN);
+    var wantEnd = Math.min(state.total, first + visible + OVERSCAN);
+    var haveEnd = state.start + state.rows.length;
+    if (want < state.start || wantEnd > haveEnd) {
+      requestWindow(want, Math.max(%(batch)d, wantEnd - want));
+    }
+    var head = '<tr>' + state.columns.map(function(c) { return '<th>' + esc(c) + '</th>'; }).join('') + '</tr>';
+    var body = state.rows.map(function(r) {
+      return '<tr>' + r.map(function(v) { return '<td>' + esc(v) + '</td>'; }).join('') + '</tr>';
+    }).join('');
+    el.querySelector('.spacer').style.height = ((state.total + 1) * ROW_HEIGHT) + 'px';
+    var table = el.querySelector('table');
+    table.style.top = (state.start * ROW_HEIGHT) + 'px';
+    table.innerHTML = '<thead>' + head + '</thead><tbody>' + body + '</tbody>';
+  }
+
+  Shiny.addCustomMessageHandler('course_grid_reset', function(msg) {
+    state.total = msg.total;
+    state.columns = msg.columns;
+    state.query = msg.query;
+    state.start = 0;
+    state.rows = [];
+    state.pending = null;
+    var el = grid();
+    if (el) el.scrollTop = 0;
+    render();
+  });
+
+  Shiny.addCustomMessageHandler('course_grid_rows', function(msg) {
+    if (msg.query !== state.query) return;
+    state.start = msg.start;
+    state.rows = JSON.parse(msg.rows);
+    state.pending = null;
+    render();
+  });
+
+  document.addEventListener('scroll', function(e) {
+    if (e.target && e.target.id === 'course_grid') window.requestAnimationFrame(render);
+  }, true);
+})();
+""" % {"batch": BATCH_SIZE}
 
 app_ui = ui.page_fluid(
-    ui.output_table("table"),
+    ui.tags.style(VIRTUAL_TABLE_CSS),
+    ui.layout_sidebar(
+        ui.panel_sidebar(
+            ui.input_selectize("term", "Term", choices=[], multiple=True),
+            ui.input_selectize("course", "Course", choices=[], multiple=True),
+            ui.input_selectize("mode", "Teaching mode", choices=[], multiple=True),
+            ui.input_select("sort_by", "Sort by", choices=SORT_CHOICES),
+            ui.input_checkbox("descending", "Descending", value=False),
+        ),
+        ui.panel_main(
+            ui.output_text("summary"),
+            ui.div(ui.div(class_="spacer"), ui.tags.table(), id="course_grid"),
+        ),
+    ),
+    ui.tags.script(VIRTUAL_TABLE_JS),
 )
 
 
 def server(input, output, session):
+    # The dataset itself is shared by all sessions; polling only stats the file
+    @reactive.poll(COURSE_DATA.stamp, POLL_INTERVAL)
+    def dataset_version():
+        COURSE_DATA.frame()
+        return COURSE_DATA.version
+
+    @reactive.Effect
+    def _refresh_choices():
+        dataset_version()
+        for input_id, column in (("term", TERM_COLUMN), ("course", COURSE_COLUMN), ("mode", MODE_COLUMN)):
+            with reactive.isolate():
+                selected = [s for s in input[input_id]() if s in COURSE_DATA.choices(column)]
+            ui.update_selectize(input_id, choices=COURSE_DATA.choices(column), selected=selected)
+
+    @reactive.Calc
+    def matching_rows():
+        dataset_version()
+        return COURSE_DATA.query(
+            terms=input.term(),
+            courses=input.course(),
+            modes=input.mode(),
+            sort_by=input.sort_by() or None,
+            descending=input.descending(),
+        )
+
+    # Bumped on every new result set so stale batch replies are ignored client-side
+    query_id = reactive.Value(0)
+
     @output
-    @render.table
-    def table():
-        infile = Path(__file__).parent / "courses.csv"
-        df = pandas.read_csv(infile)
-        # Use the DataFrame's to_html() function to convert it to an HTML table, and
-        # then wrap with ui.HTML() so Shiny knows to treat it as raw HTML.
-        return df.head()
+    @render.text
+    def summary():
+        return f"{len(matching_rows().positions):,} rows"
+
+    @reactive.Effect
+    async def _reset_grid():
+        result = matching_rows()
+        with reactive.isolate():
+            query_id.set(query_id() + 1)
+            current = query_id()
+        columns = [c for c in DISPLAY_COLUMNS if c in COURSE_DATA.frame().columns]
+        await session.send_custom_message(
+            "course_grid_reset",
+            {"query": current, "total": int(len(result.positions)), "columns": columns},
+        )
+
+    @reactive.Effect
+    @reactive.event(input.table_window)
+    async def _send_rows():
+        request = input.table_window()
+        if request.get("query") != query_id():
+            return
+        start = max(int(request.get("start", 0)), 0)
+        count = min(max(int(request.get("count", BATCH_SIZE)), 1), MAX_BATCH_SIZE)
+        with reactive.isolate():
+            result = matching_rows()
+        rows = COURSE_DATA.window(result, start, count, DISPLAY_COLUMNS)
+        # Compact row batch: column order is sent once on reset, rows as JSON arrays
+        await session.send_custom_message(
+            "course_grid_rows",
+            {"query": request["query"], "start": start, "rows": rows.to_json(orient="values")},
+        )
 
 
-app = App(app_ui, server)
\ No newline at end of file
+app = App(app_ui, server)
@@ -0,0 +1,180 @@
+"""Shared, cached access to the course dataset used by the Shiny app.
+
+The CSV is parsed once per process and shared by every session. A cheap
+``os.stat`` check runs on each access and the file is only re-read when its
+mtime/size change *and* its content hash differs. Filtering and sorting are
+done server-side on the cached frame and the resulting row orderings are
+memoized so concurrent sessions asking for the same view share the work.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+import numpy as np
+import pandas
+
+DATA_FILE = Path(__file__).parent / "courses.csv"
+
+TERM_COLUMN = "Term"
+COURSE_COLUMN = "Course"
+MODE_COLUMN = "Teaching_Mode"
+FILTER_COLUMNS = (TERM_COLUMN, COURSE_COLUMN, MODE_COLUMN)
+
+QUERY_CACHE_SIZE = 64
+
+# Row positions of a filtered/sorted view, tagged with the dataset version they index
+QueryResult = namedtuple("QueryResult", ["version", "positions"])
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _prepare(df):
+    # Course key in display form: PF*521-F1FF -> PF 521
+    if "Session_Code" in df.columns:
+        course = df["Session_Code"].astype(str).str.extract(r"^([A-Za-z]+\*\d+)")[0]
+        course = course.str.replace("*", " ", regex=False)
+        if "Course_Code" in df.columns:
+            course = course.fillna(df["Course_Code"].astype(str))
+        df[COURSE_COLUMN] = course
+    elif "Course_Code" in df.columns:
+        df[COURSE_COLUMN] = df["Course_Code"].astype(str).str.replace("*", " ", regex=False)
+
+    # Categoricals make the equality filters cheap on large histories
+    for column in FILTER_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].fillna("Unknown").astype("category")
+    return df.reset_index(drop=True)
+
+
+class CourseDataCache:
+    """Process-wide cache of the course dataset with change detection."""
+
+    def __init__(self, path=DATA_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._digest = None
+        self._frame = pandas.DataFrame()
+        self._version = 0
+        self._queries = OrderedDict()
+
+    def stamp(self):
+        """Cheap change indicator (mtime, size); suitable for ``reactive.poll``."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    @property
+    def version(self):
+        return self._version
+
+    def snapshot(self):
+        """Return ``(version, frame)`` read together, after any pending reload."""
+        self.frame()
+        with self._lock:
+            return self._version, self._frame
+
+    def frame(self):
+        """Return the cached DataFrame, reloading only if the file changed."""
+        stamp = self.stamp()
+        if stamp == self._stamp:
+            return self._frame
+        with self._lock:
+            if stamp == self._stamp:
+                return self._frame
+            if stamp is None:
+                self._replace(pandas.DataFrame(), None, None)
+                return self._frame
+            digest = _file_digest(self.path)
+            if digest != self._digest:
+                self._replace(_prepare(pandas.read_csv(self.path)), stamp, digest)
+            else:
+                # Touched but unchanged: keep the parsed frame
+                self._stamp = stamp
+            return self._frame
+
+    def _replace(self, frame, stamp, digest):
+        self._frame = frame
+        self._stamp = stamp
+        self._digest = digest
+        self._version += 1
+        self._queries.clear()
+
+    def choices(self, column):
+        df = self.frame()
+        if column not in df.columns:
+            return []
+        return sorted(str(value) for value in df[column].cat.categories)
+
+    def query(self, terms=(), courses=(), modes=(), sort_by=None, descending=False):
+        """Return a ``QueryResult`` with the row positions matching the filters, in sorted order.
+
+        Results are memoized per dataset version so every session requesting the
+        same view reuses one filter/sort pass.
+        """
+        version, df = self.snapshot()
+        key = (
+            version,
+            tuple(sorted(terms)),
+            tuple(sorted(courses)),
+            tuple(sorted(modes)),
+            sort_by,
+            bool(descending),
+        )
+        with self._lock:
+            if key in self._queries:
+                self._queries.move_to_end(key)
+                return QueryResult(version, self._queries[key])
+
+        mask = np.ones(len(df), dtype=bool)
+        for column, selected in zip(FILTER_COLUMNS, (terms, courses, modes)):
+            if selected and column in df.columns:
+                mask &= df[column].isin(selected).to_numpy()
+        positions = np.flatnonzero(mask)
+
+        if sort_by and sort_by in df.columns and len(positions):
+            values = df[sort_by].iloc[positions].reset_index(drop=True)
+            if isinstance(values.dtype, pandas.CategoricalDtype):
+                values = values.astype(str)
+            order = values.sort_values(
+                ascending=not descending, kind="stable", na_position="last"
+            ).index.to_numpy()
+            positions = positions[order]
+
+        positions.setflags(write=False)
+        with self._lock:
+            if version == self._version:
+                self._queries[key] = positions
+                while len(self._queries) > QUERY_CACHE_SIZE:
+                    self._queries.popitem(last=False)
+        return QueryResult(version, positions)
+
+    def window(self, result, start, count, columns=None):
+        """Materialize ``count`` rows of a ``QueryResult`` starting at ``start``.
+
+        If the dataset was reloaded since the query ran, the positions no longer
+        describe the current frame and no rows are returned; the new version
+        triggers a fresh query.
+        """
+        version, df = self.snapshot()
+        if result.version != version:
+            df = df.iloc[0:0]
+        else:
+            df = df.iloc[result.positions[start:start + count]]
+        if columns:
+            df = df[[c for c in columns if c in df.columns]]
+        return df
+
+
+COURSE_DATA = CourseDataCache()
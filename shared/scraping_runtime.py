@@ -0,0 +1,610 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Shared Scraping Runtime
+
+Common browser runtime used by the Franklin course scrapers
+(teach/franklin-course-scraper) and the Indeed job counter (posts/job_listing),
+which add this directory to sys.path. Provides Chrome driver construction and pooling, network-level
+resource blocking, rate limiting, retries, timing metrics and clean shutdown,
+so performance fixes land once for every scraper in the repo.
+
+Long runs are kept inside a fixed memory ceiling by ManagedDriver, which
+transparently restarts Chrome after a page budget or when the browser
+process tree's RSS crosses a threshold, carrying cookies across restarts.
+
+SelectorCache probes fallback XPath selectors with implicit wait off and
+remembers the winning generic selector per page template.
+
+NetworkCapture reads the JSON responses a page fetched (DevTools performance
+log + Network.getResponseBody), so scrapers can use the structured data the
+UI renders from instead of parsing the HTML back apart.
+
+Author: Course Analytics Project
+Version: 1.0 (Shared Runtime)
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple, Type
+
+DEFAULT_USER_AGENT = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+# Requests Chrome is told not to make at all (DevTools Network.setBlockedURLs)
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+]
+
+
+@dataclass
+class DriverConfig:
+    """Chrome settings shared by every scraper"""
+    headless: bool = True
+    window_size: str = "1920,1080"
+    user_agent: str = DEFAULT_USER_AGENT
+    implicit_wait: float = 0          # seconds; prefer explicit waits
+    page_load_strategy: str = "normal"  # "eager": don't wait for subresources
+    block_resources: bool = False     # drop BLOCKED_URL_PATTERNS requests (opt-in)
+    hide_automation: bool = True
+    use_webdriver_manager: bool = False  # fall back to Selenium Manager if unavailable
+    capture_network: bool = False  # record DevTools network events for NetworkCapture
+    extra_arguments: List[str] = field(default_factory=list)
+
+    # Driver recycling (None disables a threshold)
+    max_pages_per_driver: Optional[int] = 200
+    max_rss_mb: Optional[int] = 1024
+    rss_check_interval: int = 5  # pages between RSS samples
+
+
+class RunMetrics:
+    """Thread-safe timing and counter collection for a scraper run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.counters: Dict[str, int] = defaultdict(int)
+
+    @contextmanager
+    def timed(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.timings[name].append(elapsed)
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def summary(self) -> dict:
+        with self._lock:
+            timings = {name: {'n': len(values), 'total': round(sum(values), 3),
+                              'mean': round(sum(values) / len(values), 3), 'max': round(max(values), 3)}
+                       for name, values in self.timings.items() if values}
+            return {'timings': timings, 'counters': dict(self.counters)}
+
+    def report(self):
+        summary = self.summary()
+        if not summary['timings'] and not summary['counters']:
+            return
+        print("⏱️  Run metrics:")
+        for name, t in sorted(summary['timings'].items()):
+            print(f"   {name}: n={t['n']} total={t['total']:.1f}s mean={t['mean']:.2f}s max={t['max']:.2f}s")
+        for name, value in sorted(summary['counters'].items()):
+            print(f"   {name}: {value}")
+        # Selector hit rates recorded by SelectorCache
+        for name, lookups in sorted(summary['counters'].items()):
+            if name.startswith('selector.') and name.endswith('.lookups') and lookups:
+                template = name[:-len('.lookups')]
+                first = summary['counters'].get(f"{template}.first_try", 0)
+                found = summary['counters'].get(f"{template}.found", 0)
+                print(f"   {template}: first-try hit rate {first / lookups:.0%}, found {found / lookups:.0%}")
+
+
+class RateLimiter:
+    """Space calls at least `interval` seconds apart, shared by all threads"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def retry(func: Callable, attempts: int = 3, backoff: float = 1.0,
+          retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+          stop_on: Tuple[Type[BaseException], ...] = (),
+          on_error: Optional[Callable[[int, BaseException], None]] = None,
+          metrics: Optional[RunMetrics] = None):
+    """Call `func` up to `attempts` times with exponential backoff between failures.
+
+    Exceptions in `stop_on` are re-raised immediately; the last failure is
+    re-raised once attempts are exhausted.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            return func()
+        except stop_on:
+            raise
+        except retry_on as e:
+            if on_error:
+                on_error(attempt, e)
+            if attempt == attempts:
+                raise
+            if metrics:
+                metrics.count('retries')
+            time.sleep(backoff * (2 ** (attempt - 1)))
+
+
+@contextmanager
+def zero_implicit_wait(driver, restore: float = 0):
+    """Probe for elements without paying the implicit wait on every miss"""
+    if not restore:
+        yield driver
+        return
+    driver.implicitly_wait(0)
+    try:
+        yield driver
+    finally:
+        driver.implicitly_wait(restore)
+
+
+class SelectorCache:
+    """Ordered XPath fallbacks that learn which selector works per page template
+
+    `find` probes the selectors with implicit wait off. The first `specific`
+    selectors (e.g. ones naming the course) are always tried first, in the
+    given order, so a generic selector that matched once can never outrank
+    them; only the generic tier after them is reordered, trying the one that
+    last matched on the same template and page path first. Lookups, first-try
+    hits and probes are counted in `metrics` as selector.<template>.* so
+    RunMetrics reports hit rates. Selector lists may embed per-course text;
+    the cache remembers positions.
+    """
+
+    def __init__(self, metrics: Optional[RunMetrics] = None, implicit_wait: float = 0):
+        self.metrics = metrics
+        self.implicit_wait = implicit_wait  # restored after probing
+        self._winners: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, template: str, name: str, amount: int = 1):
+        if self.metrics:
+            self.metrics.count(f"selector.{template}.{name}", amount)
+
+    @staticmethod
+    def page(driver) -> str:
+        """Path of the driver's current URL; winners are remembered per template and page"""
+        from urllib.parse import urlparse
+        try:
+            return urlparse(driver.current_url).path
+        except Exception:
+            return ''
+
+    def order(self, key: Tuple[str, str], count: int, specific: int = 0) -> List[int]:
+        specific = min(max(0, specific), count)
+        with self._lock:
+            winner = self._winners.get(key)
+        fallbacks = list(range(specific, count))
+        if winner in fallbacks:
+            fallbacks.remove(winner)
+            fallbacks.insert(0, winner)
+        return list(range(specific)) + fallbacks
+
+    def find(self, driver, template: str, selectors: List[str],
+             accept: Optional[Callable] = None, specific: int = 0):
+        """First element accepted by `accept` (default: any), else the first element found, else None"""
+        from selenium.webdriver.common.by import By
+
+        self._count(template, 'lookups')
+        key = (template, self.page(driver))
+        fallback = None
+        order = self.order(key, len(selectors), specific)
+        with zero_implicit_wait(driver, self.implicit_wait):
+            for probes, index in enumerate(order, 1):
+                try:
+                    elements = driver.find_elements(By.XPATH, selectors[index])
+                except Exception:
+                    continue
+                for element in elements:
+                    try:
+                        ok = accept is None or accept(element)
+                    except Exception:
+                        ok = False
+                    if ok:
+                        if index >= specific:
+                            with self._lock:
+                                self._winners[key] = index
+                        self._count(template, 'probes', probes)
+                        self._count(template, 'found')
+                        if probes == 1:
+                            self._count(template, 'first_try')
+                        return element
+                    if fallback is None:
+                        fallback = element
+        self._count(template, 'probes', len(order))
+        return fallback
+
+
+class NetworkCapture:
+    """JSON responses received by a driver, read from the DevTools performance log
+
+    The driver must be created with DriverConfig(capture_network=True). Call
+    reset() before the action that triggers the requests and responses()
+    after it; bodies are fetched with Network.getResponseBody while the page
+    that requested them is still loaded.
+    """
+
+    def __init__(self, driver, metrics: Optional[RunMetrics] = None):
+        self.driver = driver
+        self.metrics = metrics
+
+    def _events(self) -> List[dict]:
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception:
+            return []
+        events = []
+        for entry in entries:
+            try:
+                events.append(json.loads(entry['message'])['message'])
+            except (KeyError, ValueError, TypeError):
+                continue
+        return events
+
+    def reset(self):
+        """Discard everything logged so far"""
+        self._events()
+
+    def responses(self, url_fragment: str = '') -> List[Tuple[str, object]]:
+        """[(url, parsed JSON body)] for JSON responses since the last call, oldest first"""
+        captured = []
+        for event in self._events():
+            if event.get('method') != 'Network.responseReceived':
+                continue
+            params = event.get('params', {})
+            response = params.get('response', {})
+            url = response.get('url', '')
+            if url_fragment not in url or 'json' not in response.get('mimeType', ''):
+                continue
+            try:
+                body = self.driver.execute_cdp_cmd('Network.getResponseBody',
+                                                   {'requestId': params['requestId']})
+                captured.append((url, json.loads(body.get('body', ''))))
+            except Exception:
+                # Evicted from the buffer or not finished loading
+                if self.metrics:
+                    self.metrics.count('capture.missed')
+                continue
+            if self.metrics:
+                self.metrics.count('capture.responses')
+        return captured
+
+    def latest(self, url_fragment: str = ''):
+        """Most recent JSON body whose URL contains `url_fragment`, else None"""
+        captured = self.responses(url_fragment)
+        return captured[-1][1] if captured else None
+
+
+def create_driver(config: Optional[DriverConfig] = None):
+    """Start a Chrome WebDriver configured for scraping"""
+    # Selenium is only imported once a browser is actually needed
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
+    config = config or DriverConfig()
+    chrome_options = Options()
+    if config.headless:
+        chrome_options.add_argument("--headless")
+    if config.hide_automation:
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+
+    # Performance optimizations
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument(f"--window-size={config.window_size}")
+    chrome_options.add_argument(f"--user-agent={config.user_agent}")
+    for argument in config.extra_arguments:
+        chrome_options.add_argument(argument)
+    chrome_options.page_load_strategy = config.page_load_strategy
+    if config.capture_network:
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    service = None
+    if config.use_webdriver_manager:
+        try:
+            from selenium.webdriver.chrome.service import Service
+            from webdriver_manager.chrome import ChromeDriverManager
+            service = Service(ChromeDriverManager().install())
+        except ImportError:
+            service = None
+
+    driver = (webdriver.Chrome(service=service, options=chrome_options) if service
+              else webdriver.Chrome(options=chrome_options))
+    try:
+        if config.block_resources or config.capture_network:
+            driver.execute_cdp_cmd("Network.enable", {})
+        if config.block_resources:
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        if config.hide_automation:
+            # Applies to every page loaded by this driver, not just the current one
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                "source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"})
+        driver.implicitly_wait(config.implicit_wait)
+    except Exception:
+        driver.quit()
+        raise
+    return driver
+
+
+def _child_pids(pid: int) -> List[int]:
+    """Direct children of `pid` from /proc (Linux only)"""
+    children = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                children.extend(int(c) for c in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def _rss_bytes(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def process_tree_rss_mb(pid: Optional[int]) -> Optional[float]:
+    """Resident memory of a process and all its descendants, in MB"""
+    if not pid:
+        return None
+    try:
+        import psutil
+        root = psutil.Process(pid)
+        procs = [root] + root.children(recursive=True)
+        total = 0
+        for proc in procs:
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / (1024 * 1024)
+    except ImportError:
+        pass
+    except Exception:
+        return None
+
+    if not os.path.exists(f"/proc/{pid}"):
+        return None
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        total += _rss_bytes(current)
+        stack.extend(_child_pids(current))
+    return total / (1024 * 1024)
+
+
+def _cdp_cookie(cookie: dict) -> dict:
+    """Selenium cookie dict -> DevTools Network.setCookies entry"""
+    converted = {key: cookie[key] for key in ('name', 'value', 'domain', 'path', 'secure', 'httpOnly')
+                 if key in cookie}
+    if 'expiry' in cookie:
+        converted['expires'] = cookie['expiry']
+    if cookie.get('sameSite') in ('Strict', 'Lax', 'None'):
+        converted['sameSite'] = cookie['sameSite']
+    return converted
+
+
+class ManagedDriver:
+    """WebDriver proxy that restarts Chrome past page-count or memory thresholds
+
+    Everything except get()/quit() is delegated to the current driver, so the
+    scrapers use it exactly like a plain WebDriver. Cookies (and with them the
+    Self-Service session) are copied to the replacement browser.
+    """
+
+    def __init__(self, config: DriverConfig, metrics: Optional[RunMetrics] = None,
+                 factory: Optional[Callable] = None):
+        self._config = config
+        self._metrics = metrics
+        self._factory = factory or (lambda: create_driver(config))
+        self._driver = self._factory()
+        self.pages = 0
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
+
+    @property
+    def wrapped_driver(self):
+        return self._driver
+
+    def browser_rss_mb(self) -> Optional[float]:
+        service = getattr(self._driver, 'service', None)
+        process = getattr(service, 'process', None)
+        return process_tree_rss_mb(getattr(process, 'pid', None))
+
+    def _should_recycle(self) -> Optional[str]:
+        config = self._config
+        if config.max_pages_per_driver and self.pages >= config.max_pages_per_driver:
+            return f"{self.pages} pages"
+        if (config.max_rss_mb and self.pages
+                and self.pages % max(1, config.rss_check_interval) == 0):
+            rss = self.browser_rss_mb()
+            if rss is not None and rss > config.max_rss_mb:
+                return f"RSS {rss:.0f} MB > {config.max_rss_mb} MB"
+        return None
+
+    def recycle(self, reason: str = "requested"):
+        """Replace the browser, keeping cookies and the implicit wait"""
+        try:
+            cookies = self._driver.get_cookies()
+        except Exception:
+            cookies = []
+        old = self._driver
+        try:
+            old.quit()
+        except Exception:
+            pass
+        self._driver = self._factory()
+        if cookies:
+            try:
+                self._driver.execute_cdp_cmd("Network.setCookies",
+                                             {"cookies": [_cdp_cookie(c) for c in cookies]})
+            except Exception as e:
+                print(f"⚠️  Could not restore cookies after recycle: {e}")
+        self.pages = 0
+        if self._metrics:
+            self._metrics.count('driver_recycles')
+        print(f"♻️  Recycled browser ({reason})")
+
+    def get(self, url: str):
+        reason = self._should_recycle()
+        if reason:
+            self.recycle(reason)
+        self.pages += 1
+        return self._driver.get(url)
+
+    def quit(self):
+        self._driver.quit()
+
+
+class DriverLease:
+    """A pool slot whose driver is only started on first use"""
+
+    def __init__(self, pool: 'DriverPool'):
+        self._pool = pool
+        self._driver = None
+        self._broken = False
+
+    def get(self):
+        if self._driver is None:
+            self._driver = self._pool._checkout()
+        return self._driver
+
+    def discard(self):
+        """Mark the driver as unusable so it is quit instead of returned"""
+        self._broken = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._driver is not None:
+            self._pool._checkin(self._driver, broken=self._broken)
+            self._driver = None
+        return False
+
+
+class DriverPool:
+    """Bounded pool of reusable drivers with guaranteed shutdown"""
+
+    def __init__(self, config: Optional[DriverConfig] = None, size: int = 1,
+                 metrics: Optional[RunMetrics] = None,
+                 factory: Optional[Callable] = None):
+        self.config = config or DriverConfig()
+        self.size = max(1, size)
+        self.metrics = metrics or RunMetrics()
+        self._factory = factory or (lambda: ManagedDriver(self.config, self.metrics))
+        self._idle: List = []
+        self._all: List = []
+        self._cond = threading.Condition()
+        self._closed = False
+        atexit.register(self.close)
+
+    def _checkout(self):
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("driver pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if len(self._all) < self.size:
+                    # Reserve the slot before the (slow) browser start
+                    self._all.append(None)
+                    break
+                self._cond.wait()
+        try:
+            with self.metrics.timed('driver_start'):
+                driver = self._factory()
+        except Exception:
+            with self._cond:
+                self._all.remove(None)
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._all[self._all.index(None)] = driver
+        self.metrics.count('drivers_started')
+        return driver
+
+    def _checkin(self, driver, broken: bool = False):
+        with self._cond:
+            if broken or self._closed:
+                if driver in self._all:
+                    self._all.remove(driver)
+            else:
+                self._idle.append(driver)
+                driver = None
+            self._cond.notify()
+        if driver is not None:
+            self._quit(driver)
+
+    def lease(self) -> DriverLease:
+        return DriverLease(self)
+
+    @contextmanager
+    def acquire(self):
+        with self.lease() as lease:
+            try:
+                yield lease.get()
+            except Exception:
+                lease.discard()
+                raise
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        atexit.unregister(self.close)
+        with self._cond:
+            self._closed = True
+            drivers = [d for d in self._all if d is not None]
+            self._all = []
+            self._idle = []
+            self._cond.notify_all()
+        for driver in drivers:
+            self._quit(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Hand-Entered Annotation Store
+
+Keeps the manually maintained Note and Recitation columns of the reference
+workbook in a small CSV keyed by Course_Code/Session_Code, apart from the
+generated section data. Exports join it back in with one vectorized merge,
+and edits made in the workbook are harvested into it before each rebuild.
+
+Author: Course Category Project
+Version: 1.0
+"""
+
+import os
+from typing import List
+
+import pandas as pd
+
+from course_key import star_code
+
+ANNOTATION_KEYS = ['Course_Code', 'Session_Code']
+ANNOTATION_COLUMNS = ['Note', 'Recitation']
+
+
+class AnnotationStore:
+    """Note/Recitation values indexed by (Course_Code, Session_Code)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.frame = self._load()
+        self.dirty = False
+
+    def _load(self) -> pd.DataFrame:
+        if os.path.exists(self.path):
+            frame = pd.read_csv(self.path, dtype=str, keep_default_na=False)
+            # Stores saved before the DATA*610 form key on "PF-521*Advanced"
+            frame['Course_Code'] = frame['Course_Code'].map(star_code)
+            frame = frame.drop_duplicates(ANNOTATION_KEYS, keep='last')
+            return frame.set_index(ANNOTATION_KEYS)[ANNOTATION_COLUMNS]
+        index = pd.MultiIndex.from_arrays([[], []], names=ANNOTATION_KEYS)
+        return pd.DataFrame(columns=ANNOTATION_COLUMNS, index=index, dtype=str)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def update(self, edits: pd.DataFrame):
+        """
+        Upsert annotations in place; rows in `edits` win, including cleared ('') values.
+
+        Only the annotation columns `edits` carries are merged, and missing (NaN)
+        values keep what is stored, so a Note-only edit leaves Recitation alone.
+
+        Args:
+            edits (pd.DataFrame): ANNOTATION_KEYS plus any of ANNOTATION_COLUMNS
+        """
+        if edits.empty:
+            return
+        present = [c for c in ANNOTATION_COLUMNS if c in edits.columns]
+        edits = edits[ANNOTATION_KEYS + present].astype(object)
+        edits[ANNOTATION_KEYS] = edits[ANNOTATION_KEYS].astype(str)
+        edits['Course_Code'] = edits['Course_Code'].map(star_code)
+        edits[present] = edits[present].where(edits[present].isna(), edits[present].astype(str))
+        edits = edits.drop_duplicates(ANNOTATION_KEYS, keep='last').set_index(ANNOTATION_KEYS)
+        merged = edits.combine_first(self.frame).reindex(columns=ANNOTATION_COLUMNS).fillna('').astype(str)
+        # Rows with nothing left to remember don't need to be stored
+        merged = merged[(merged != '').any(axis=1)].sort_index()
+        if not merged.equals(self.frame):
+            self.frame = merged
+            self.dirty = True
+
+    def harvest(self, ws) -> int:
+        """
+        Pull Note/Recitation edits from an already-loaded worksheet.
+
+        Only the key and annotation columns are read. Returns the number of
+        rows harvested (0 when the sheet lacks the key columns).
+        """
+        rows = ws.iter_rows(values_only=True)
+        header = list(next(rows, ()))
+        if not all(key in header for key in ANNOTATION_KEYS):
+            return 0
+        present = [c for c in ANNOTATION_COLUMNS if c in header]
+        wanted = [header.index(c) for c in ANNOTATION_KEYS + present]
+        records = [[row[i] for i in wanted] for row in rows if row and row[wanted[0]] is not None]
+        frame = pd.DataFrame(records, columns=ANNOTATION_KEYS + present, dtype=object)
+        frame = frame.where(frame.notna(), '').astype(str)
+        self.update(frame)
+        return len(frame)
+
+    def merge(self, data: pd.DataFrame, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Left-join annotations onto generated data in one vectorized merge.
+
+        Args:
+            data (pd.DataFrame): Generated rows with ANNOTATION_KEYS columns
+            columns (List[str]): Optional final column order
+        """
+        keys = pd.MultiIndex.from_arrays([data['Course_Code'].astype(str).map(star_code),
+                                          data['Session_Code'].astype(str)], names=ANNOTATION_KEYS)
+        values = self.frame.reindex(keys)
+        merged = data.drop(columns=ANNOTATION_COLUMNS, errors='ignore').assign(
+            **{column: values[column].to_numpy() for column in ANNOTATION_COLUMNS})
+        merged[ANNOTATION_COLUMNS] = merged[ANNOTATION_COLUMNS].fillna('')
+        return merged[columns] if columns else merged
+
+    def save(self):
+        """Write the store if anything changed (atomic replace)"""
+        if not self.dirty:
+            return
+        tmp_path = self.path + '.tmp'
+        self.frame.reset_index().to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+        self.dirty = False
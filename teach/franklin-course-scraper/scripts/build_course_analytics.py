@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Franklin University Course Analytics - Build Step
+
+Computes enrollment aggregates from the scraped course CSV once and writes
+them to a compact JSON artifact. The artifact is keyed by a SHA-256 hash of
+the input CSV, so repeated builds on unchanged data are skipped; the course
+schedule page renders its enrollment, waitlist, first-term and delivery-mode
+summaries from the artifact when the hash matches the CSV it displays, and
+runs compute_analytics over the CSV itself otherwise. When the scrape history
+CSV exists, per-section enrollment forecasts (enrollment_forecast.py) are
+added too.
+
+Author: Course Analytics Project
+Version: 1.0 (Precomputed Analytics)
+"""
+
+import os
+import re
+import csv
+import sys
+import json
+import hashlib
+import argparse
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+# Fix Windows console encoding issue for emoji characters
+if sys.platform == 'win32':
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "data"))
+DEFAULT_INPUT = os.path.join(DATA_DIR, "franklin_courses.csv")
+DEFAULT_OUTPUT = os.path.join(DATA_DIR, "course_analytics.json")
+DEFAULT_HISTORY = os.path.join(DATA_DIR, "franklin_courses_history.csv")
+
+ARTIFACT_VERSION = 2
+HASH_CHUNK_SIZE = 1 << 16
+
+# Same extraction the course schedule page uses: PF*521-F1FF -> PF*521
+COURSE_KEY_PATTERN = re.compile(r'^([A-Z]+\*\d+)')
+
+
+def hash_file(path: str) -> str:
+    """Return the SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_artifact(path: str = DEFAULT_OUTPUT) -> Optional[dict]:
+    """Load a previously built analytics artifact, or None if unavailable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+def _ratio(numerator: int, denominator: int) -> float:
+    return round(numerator / denominator, 4) if denominator else 0.0
+
+
+class _Totals:
+    """Running enrollment totals for one aggregation group"""
+
+    __slots__ = ('sections', 'enrolled', 'capacity', 'waitlist',
+                 'waitlisted_sections', 'full_sections')
+
+    def __init__(self):
+        self.sections = 0
+        self.enrolled = 0
+        self.capacity = 0
+        self.waitlist = 0
+        self.waitlisted_sections = 0
+        self.full_sections = 0
+
+    def add(self, enrolled: int, capacity: int, waitlist: int):
+        self.sections += 1
+        self.enrolled += enrolled
+        self.capacity += capacity
+        self.waitlist += waitlist
+        if waitlist > 0:
+            self.waitlisted_sections += 1
+        if capacity and enrolled >= capacity:
+            self.full_sections += 1
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'sections': self.sections,
+            'enrolled': self.enrolled,
+            'capacity': self.capacity,
+            'available': max(self.capacity - self.enrolled, 0),
+            'waitlist': self.waitlist,
+            'fill_rate': _ratio(self.enrolled, self.capacity),
+            # Waitlisted students per seat of capacity
+            'waitlist_pressure': _ratio(self.waitlist, self.capacity),
+            'waitlisted_sections': self.waitlisted_sections,
+            'full_sections': self.full_sections,
+        }
+
+
+def compute_analytics(rows: List[Dict[str, str]]) -> dict:
+    """Aggregate section rows into overall, first-term, per-course and per-mode summaries"""
+    overall = _Totals()
+    first_term = _Totals()
+    courses: Dict[str, _Totals] = {}
+    course_meta: Dict[str, dict] = {}
+    modes: Dict[str, _Totals] = {}
+    scraped_datetime = ''
+
+    for row in rows:
+        session_code = row.get('Session_Code', '') or ''
+        match = COURSE_KEY_PATTERN.match(session_code)
+        course_key = match.group(1) if match else (row.get('Course_Code') or 'Unknown')
+        mode = (row.get('Teaching_Mode') or 'Unknown').strip() or 'Unknown'
+        is_first_term = (row.get('First_Term') or '').strip() == 'Yes'
+
+        enrolled = _to_int(row.get('Enrolled_Seats')) or 0
+        capacity = _to_int(row.get('Total_Seats')) or 0
+        waitlist = _to_int(row.get('Waitlist')) or 0
+
+        overall.add(enrolled, capacity, waitlist)
+        courses.setdefault(course_key, _Totals()).add(enrolled, capacity, waitlist)
+        modes.setdefault(mode, _Totals()).add(enrolled, capacity, waitlist)
+        if is_first_term:
+            first_term.add(enrolled, capacity, waitlist)
+
+        if course_key not in course_meta:
+            course_meta[course_key] = {
+                'display': course_key.replace('*', ' '),
+                'name': row.get('Course_Name', ''),
+                'first_term': is_first_term,
+            }
+        scraped_datetime = scraped_datetime or row.get('Scraped_DateTime', '')
+
+    course_summaries = {}
+    for key in sorted(courses):
+        course_summaries[key] = {**course_meta[key], **courses[key].summary()}
+
+    # First-term coverage: share of first-term courses that still have open seats
+    first_term_courses = [key for key, meta in course_meta.items() if meta['first_term']]
+    open_first_term = [key for key in first_term_courses
+                       if courses[key].capacity > courses[key].enrolled]
+    first_term_summary = first_term.summary()
+    first_term_summary.update({
+        'courses': len(first_term_courses),
+        'courses_with_open_seats': len(open_first_term),
+        'coverage': _ratio(len(open_first_term), len(first_term_courses)),
+    })
+
+    overall_summary = overall.summary()
+    overall_summary['courses'] = len(courses)
+
+    return {
+        'scraped_datetime': scraped_datetime,
+        'overall': overall_summary,
+        'first_term': first_term_summary,
+        'courses': course_summaries,
+        'modes': {mode: modes[mode].summary() for mode in sorted(modes)},
+    }
+
+
+def build_analytics(input_path: str = DEFAULT_INPUT, output_path: Optional[str] = DEFAULT_OUTPUT,
+                    force: bool = False, history_path: Optional[str] = DEFAULT_HISTORY) -> Optional[dict]:
+    """Build the analytics artifact, skipping the work when the input hash is unchanged
+
+    With output_path=None the artifact is computed in memory and nothing is written.
+    """
+    if not os.path.exists(input_path):
+        print(f"⚠️  {input_path} not found, nothing to build")
+        return None
+
+    input_hash = hash_file(input_path)
+    has_history = bool(history_path) and os.path.exists(history_path)
+    history_hash = hash_file(history_path) if has_history else None
+    existing = load_artifact(output_path) if output_path else None
+    if (not force and existing
+            and existing.get('input_sha256') == input_hash
+            and existing.get('history_sha256') == history_hash
+            and existing.get('version') == ARTIFACT_VERSION):
+        print(f"✅ Analytics up to date ({input_hash[:12]}), skipping build")
+        return existing
+
+    with open(input_path, 'r', newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+
+    artifact = {
+        'version': ARTIFACT_VERSION,
+        'input_sha256': input_hash,
+        'history_sha256': history_hash,
+        'source': os.path.basename(input_path),
+        'generated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+    artifact.update(compute_analytics(rows))
+    if has_history:
+        # numpy/pandas are only needed when there is a history to fit
+        from enrollment_forecast import forecast_summary
+        artifact['forecast'] = forecast_summary(history_path)
+
+    if not output_path:
+        return artifact
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    tmp_path = f"{output_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(artifact, f, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp_path, output_path)
+
+    print(f"✅ Built analytics for {len(rows)} sections -> {output_path}")
+    return artifact
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build precomputed course analytics JSON")
+    parser.add_argument('--input', default=DEFAULT_INPUT, help="Scraped course CSV")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Analytics JSON artifact")
+    parser.add_argument('--history', default=DEFAULT_HISTORY,
+                        help="Scrape history CSV for enrollment forecasts (skipped if missing)")
+    parser.add_argument('--force', action='store_true', help="Rebuild even if the input is unchanged")
+    args = parser.parse_args(argv)
+
+    build_analytics(args.input, args.output, force=args.force, history_path=args.history)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Canonical Course Keys
+
+Franklin course codes show up in many spellings along the pipeline
+("DATA 610" in course_request.md, "DATA*610" in Self-Service, "DATA+610" in
+search URLs, "DATA-610" in link text, "DATA*610-F1FF" as section codes).
+A CourseKey is parsed once from any of them, interned so equal codes share
+one object, and carries every rendered form; CourseIndex maps keys to values
+so lookups by any spelling are a single hash probe.
+
+Author: Course Analytics Project
+Version: 1.0
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Generic, Iterator, Optional, Tuple, TypeVar
+
+# Subject letters, optional separator, catalog number: "DATA 610", "data*610",
+# "DATA-610", "DATA610", "PF*521-F1FF" (section suffix ignored)
+COURSE_CODE_PATTERN = re.compile(r'^\s*\*?\s*([A-Za-z]+)\s*[\s*+\-_]?\s*(\d+[A-Za-z]?)\b')
+
+_interned: Dict[Tuple[str, str], 'CourseKey'] = {}
+
+
+@dataclass(frozen=True)
+class CourseKey:
+    """Canonical subject + number with every display form precomputed"""
+    subject: str
+    number: str
+
+    @property
+    def display(self) -> str:
+        return f"{self.subject} {self.number}"   # DATA 610
+
+    @property
+    def star(self) -> str:
+        return f"{self.subject}*{self.number}"   # DATA*610 (Self-Service)
+
+    @property
+    def plus(self) -> str:
+        return f"{self.subject}+{self.number}"   # DATA+610 (URL query)
+
+    @property
+    def dash(self) -> str:
+        return f"{self.subject}-{self.number}"   # DATA-610 (link/title text)
+
+    @property
+    def compact(self) -> str:
+        return f"{self.subject}{self.number}"    # DATA610
+
+    def __str__(self):
+        return self.display
+
+
+@lru_cache(maxsize=4096)
+def course_key(text: str) -> Optional[CourseKey]:
+    """Parse any course or section code spelling into its interned CourseKey"""
+    match = COURSE_CODE_PATTERN.match(text or '')
+    if not match:
+        return None
+    parts = (match.group(1).upper(), match.group(2).upper())
+    key = _interned.get(parts)
+    if key is None:
+        key = _interned.setdefault(parts, CourseKey(*parts))
+    return key
+
+
+def star_code(text: str) -> str:
+    """Course_Code column value in its canonical DATA*610 form; unparseable text is kept as is
+
+    Older exports stored link titles such as "PF-521*Advanced"; this maps them
+    onto the "PF*521" the scrapers write now, so keyed joins match across both.
+    """
+    key = course_key(text)
+    return key.star if key else text
+
+
+T = TypeVar('T')
+
+
+class CourseIndex(Generic[T]):
+    """Dict keyed by CourseKey that also accepts any code spelling"""
+
+    def __init__(self, items=()):
+        self._data: Dict[CourseKey, T] = {}
+        for code, value in items:
+            self[code] = value
+
+    @staticmethod
+    def _key(code) -> Optional[CourseKey]:
+        return code if isinstance(code, CourseKey) else course_key(code)
+
+    def __setitem__(self, code, value: T):
+        key = self._key(code)
+        if key is None:
+            raise KeyError(f"not a course code: {code!r}")
+        self._data[key] = value
+
+    def __getitem__(self, code) -> T:
+        return self._data[self._key(code)]
+
+    def get(self, code, default=None):
+        return self._data.get(self._key(code), default)
+
+    def __contains__(self, code) -> bool:
+        return self._key(code) in self._data
+
+    def __iter__(self) -> Iterator[CourseKey]:
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def items(self):
+        return self._data.items()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Enrollment Trend and Fill-Date Forecasting
+
+Fits a least-squares line of Enrolled_Seats over time to every section of
+every term in the scrape history at once. Rows are mapped to integer group
+ids and the per-group sums (n, Σt, Σy, Σt², Σty) come from np.bincount, so
+the whole catalog is solved in a handful of array operations with no
+per-section Python loop. From each fit we report the daily enrollment rate,
+the enrollment projected at the section's start date, and the date the
+section is expected to fill.
+
+Author: Course Analytics Project
+Version: 1.0
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+EPOCH = pd.Timestamp(0, tz='UTC')
+MIN_OBSERVATIONS = 2   # points needed before a trend is fitted
+MIN_SPAN_DAYS = 1.0    # observations closer together than this give no usable slope
+
+FORECAST_COLUMNS = [
+    'Term', 'Session_Code', 'Course_Code', 'observations', 'enrolled', 'capacity',
+    'rate_per_day', 'projected_at_start', 'fill_date', 'fills_before_start', 'full',
+]
+
+
+def _days(values: pd.Series) -> np.ndarray:
+    """Timestamps (ISO strings or M/D/YYYY dates) -> float days since the epoch, NaN if unparseable"""
+    stamps = pd.to_datetime(values, errors='coerce', utc=True)
+    # Timedelta division is independent of the datetime resolution pandas picked
+    return ((stamps - EPOCH) / pd.Timedelta(days=1)).to_numpy(dtype=float, na_value=np.nan)
+
+
+def _date_text(days: np.ndarray) -> np.ndarray:
+    """Float days since the epoch -> 'YYYY-MM-DD' (None where NaN)"""
+    out = np.full(days.shape, None, dtype=object)
+    valid = np.isfinite(days)
+    out[valid] = (days[valid].astype('int64').astype('datetime64[D]')).astype(str)
+    return out
+
+
+def forecast_sections(history: pd.DataFrame, as_of: Optional[str] = None) -> pd.DataFrame:
+    """
+    Per-section enrollment trend for every (Term, Session_Code) in `history`.
+
+    Args:
+        history (pd.DataFrame): Scrape history rows (CSV_HEADERS columns), one
+            row per section per fetch
+        as_of (str): Ignore observations after this timestamp (default: all)
+
+    Returns:
+        pd.DataFrame: One row per section with FORECAST_COLUMNS
+    """
+    t = _days(history['Scraped_DateTime'])
+    y = pd.to_numeric(history['Enrolled_Seats'], errors='coerce').to_numpy(dtype=float)
+    cap = pd.to_numeric(history['Total_Seats'], errors='coerce').to_numpy(dtype=float)
+    start = _days(pd.to_datetime(history['Start_Date'], format='%m/%d/%Y', errors='coerce'))
+    keep = np.isfinite(t) & np.isfinite(y)
+    if as_of:
+        keep &= t <= _days(pd.Series([as_of]))[0]
+    history = history[keep]
+    t, y, cap, start = t[keep], y[keep], cap[keep], start[keep]
+    if not len(history):
+        return pd.DataFrame(columns=FORECAST_COLUMNS)
+
+    # One integer id per (term, section); everything below is indexed by it
+    groups, keys = pd.MultiIndex.from_arrays(
+        [history['Term'].astype(str), history['Session_Code'].astype(str)]).factorize()
+    k = len(keys)
+    n = np.bincount(groups, minlength=k).astype(float)
+
+    # Center time per group so the normal equations stay well conditioned
+    t0 = np.bincount(groups, weights=t, minlength=k) / n
+    tc = t - t0[groups]
+    sx = np.bincount(groups, weights=tc, minlength=k)
+    sy = np.bincount(groups, weights=y, minlength=k)
+    sxx = np.bincount(groups, weights=tc * tc, minlength=k)
+    sxy = np.bincount(groups, weights=tc * y, minlength=k)
+    denom = n * sxx - sx * sx
+    fitted = (n >= MIN_OBSERVATIONS) & (denom > 0)
+    slope = np.where(fitted, (n * sxy - sx * sy) / np.where(denom > 0, denom, 1), 0.0)
+    intercept = (sy - slope * sx) / n  # value at the group's mean time
+
+    # Latest observation per group: sort by (group, time) and take each group's last row
+    order = np.lexsort((t, groups))
+    last = order[np.r_[np.flatnonzero(np.diff(groups[order])), len(order) - 1]]
+    last_t = np.full(k, np.nan)
+    last_t[groups[last]] = t[last]
+    enrolled = np.zeros(k)
+    enrolled[groups[last]] = y[last]
+    capacity = np.full(k, np.nan)
+    capacity[groups[last]] = cap[last]
+    start_day = np.full(k, np.nan)
+    start_day[groups[last]] = start[last]
+
+    # Too little time spread for a slope: no trend, but the section is still reported
+    first_t = np.full(k, np.inf)
+    np.minimum.at(first_t, groups, t)
+    fitted &= (last_t - first_t) >= MIN_SPAN_DAYS
+    slope = np.where(fitted, slope, 0.0)
+
+    full = np.isfinite(capacity) & (enrolled >= capacity)
+    rising = fitted & (slope > 0) & ~full & np.isfinite(capacity)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Days from the last observation until the trend line reaches capacity
+        line_now = intercept + slope * (last_t - t0)
+        fill_day = np.where(rising, last_t + (capacity - line_now) / np.where(rising, slope, 1), np.nan)
+    fill_day = np.where(rising & (fill_day < last_t), last_t, fill_day)
+    fill_day = np.where(full, last_t, fill_day)
+
+    projected = np.where(fitted & np.isfinite(start_day),
+                         intercept + slope * (start_day - t0), enrolled)
+    # Enrollment can't be projected below what is already enrolled or above capacity
+    projected = np.maximum(projected, enrolled)
+    projected = np.where(np.isfinite(capacity), np.minimum(projected, capacity), projected)
+
+    course_codes = history['Course_Code'].astype(str).to_numpy()
+    course = np.empty(k, dtype=object)
+    course[groups[last]] = course_codes[last]
+
+    return pd.DataFrame({
+        'Term': keys.get_level_values(0),
+        'Session_Code': keys.get_level_values(1),
+        'Course_Code': course,
+        'observations': n.astype(int),
+        'enrolled': enrolled.astype(int),
+        'capacity': np.where(np.isfinite(capacity), capacity, -1).astype(int),
+        'rate_per_day': np.round(slope, 3),
+        'projected_at_start': np.round(projected).astype(int),
+        'fill_date': _date_text(fill_day),
+        'fills_before_start': full | (np.isfinite(fill_day) & np.isfinite(start_day) & (fill_day <= start_day)),
+        'full': full,
+    }, columns=FORECAST_COLUMNS)
+
+
+def forecast_summary(history_path: str, as_of: Optional[str] = None) -> dict:
+    """
+    Forecast block for the analytics artifact.
+
+    Top-level counts are for the term of the most recent scrape.
+
+    Returns:
+        dict: {'as_of', 'term', 'full', 'filling', 'terms': {term: counts},
+               'sections': {term: {session: {...}}}}
+    """
+    history = pd.read_csv(history_path, dtype=str, keep_default_na=False)
+    frame = forecast_sections(history, as_of)
+    values = frame.drop(columns=['Term', 'Session_Code']).astype(object)
+    values = values.where(values.notna(), None)
+    filling = frame['fills_before_start'] & ~frame['full']
+
+    sections, terms = {}, {}
+    for term, term_rows in frame.groupby('Term', sort=True):
+        records = values.loc[term_rows.index].to_dict('records')
+        sections[term] = dict(zip(term_rows['Session_Code'], records))
+        terms[term] = {'full': int(term_rows['full'].sum()), 'filling': int(filling[term_rows.index].sum())}
+
+    stamps = pd.to_datetime(history['Scraped_DateTime'], errors='coerce', utc=True)
+    latest = stamps.max()
+    current = history['Term'][stamps == latest].mode().iloc[0] if pd.notna(latest) else None
+    counts = terms.get(current, {'full': 0, 'filling': 0})
+    return {
+        'as_of': as_of or (latest.isoformat() if pd.notna(latest) else None),
+        'term': current,
+        'full': counts['full'],
+        'filling': counts['filling'],
+        'terms': terms,
+        'sections': sections,
+    }
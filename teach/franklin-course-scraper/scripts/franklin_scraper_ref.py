@@ -6,12 +6,12 @@ Franklin University Course Scraper - Production Version
 A comprehensive web scraper for Franklin University's course search system.
 Extracts detailed course information including schedules, enrollment data,
 instructor details, and teaching modes. Features intelligent Excel output
-with conditional formatting for change tracking.
+with plan-vs-actual change highlighting.
 
 Key Features:
 - Automated course data extraction via Selenium WebDriver
 - Professional Excel output with table formatting
-- Real-time conditional formatting for change tracking
+- Plan-vs-actual change highlighting computed at export time
 - Robust error handling and performance optimizations
 - Term filtering for focused data collection
 - Preservation of user data during updates
@@ -24,20 +24,31 @@ Last Updated: May 2025
 import time
 import os
 import re
+import gzip
+import sys
 from datetime import datetime
 from dataclasses import dataclass
+from pathlib import Path
 from typing import List, Optional, Tuple
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from bs4 import BeautifulSoup
 import pandas as pd
-from openpyxl import load_workbook
+from openpyxl import Workbook, load_workbook
 from openpyxl.styles import PatternFill
-from openpyxl.formatting.rule import FormulaRule
+from openpyxl.formatting.formatting import ConditionalFormattingList
+from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.utils import get_column_letter
+
+from annotation_store import AnnotationStore
+from course_key import CourseIndex, course_key
+from plan_diff import DIFF_KEYS, ChangeSet, diff_sections
+
+# The browser runtime is shared with posts/job_listing from <repo>/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'shared'))
+from scraping_runtime import DriverConfig, DriverPool, RunMetrics, SelectorCache, zero_implicit_wait
 
 # ==============================================================================
 # CONFIGURATION CONSTANTS
@@ -70,6 +81,35 @@ WEEKDAY_MAPPING_SHORT = {
     'U': 'Sun'
 }
 
+# Implicit wait for element lookups (seconds); selector probing turns it off
+IMPLICIT_WAIT = 1
+
+# Workbook retention - keep the newest daily "{term}_{YYYYMMDD}" sheets in the
+# workbook; older ones move to a gzipped CSV next to it. Plan sheets and any
+# other hand-made sheets are never rotated.
+DAILY_SHEET_RETENTION = 14
+DAILY_SHEET_PATTERN = re.compile(r'^(.+)_(\d{8})$')
+HISTORY_SUFFIX = "_history.csv.gz"
+
+# Plan sheet markup for plan-vs-actual differences
+CHANGED_FILL = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
+REMOVED_FILL = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
+NO_FILL = PatternFill(fill_type=None)
+DAILY_SHEET_REFERENCE = re.compile(r"'[^']*_\d{8}'!")
+
+# Hand-entered Note/Recitation values live next to the workbook, not in it
+ANNOTATIONS_SUFFIX = "_annotations.csv"
+
+# Column order of the daily data sheets
+EXCEL_COLUMNS = [
+    'Course_Code', 'Session_Code', 'Course_Name', 'Credits', 'Enrolled_Seats',
+    'Total_Seats', 'Waitlist', 'Weekdays', 'Class_Times', 'Classroom',
+    'Instructors', 'Teaching_Mode', 'Start_Date', 'End_Date', 'Note',
+    'First_Term', 'Recitation'
+]
+# Archived daily sheets are reindexed to one fixed layout, whatever columns they had
+HISTORY_COLUMNS = ['Sheet', 'Snapshot_Date'] + EXCEL_COLUMNS
+
 # ==============================================================================
 # DATA MODELS
 # ==============================================================================
@@ -149,49 +189,40 @@ class FranklinCourseScraper:
         self.base_url = "https://selfservice.franklin.edu/Student/Courses/Search"
         self.driver = None
         self.headless = headless
+        self.metrics = RunMetrics()
+        self.pool = DriverPool(DriverConfig(
+            headless=headless,
+            hide_automation=False,
+            page_load_strategy="eager",
+            implicit_wait=IMPLICIT_WAIT,  # Reduced implicit wait for faster element detection
+            extra_arguments=[
+                "--disable-web-security",
+                "--disable-features=VizDisplayCompositor",
+                "--disable-extensions",
+                "--disable-plugins",
+                "--disable-images",  # Critical: Disable image loading for speed
+                "--disable-javascript-harmony-shipping",
+                "--disable-background-timer-throttling",
+                "--disable-renderer-backgrounding",
+                "--disable-backgrounding-occluded-windows",
+            ]), metrics=self.metrics)
+        self.selectors = SelectorCache(self.metrics, implicit_wait=IMPLICIT_WAIT)
         self.setup_driver()
     
     def setup_driver(self):
         """
-        Configure and initialize Chrome WebDriver with performance optimizations.
+        Initialize Chrome WebDriver through the shared scraping runtime.
         
-        Sets up Chrome with various flags for optimal scraping performance:
-        - Disables unnecessary features (images, plugins, etc.)
-        - Configures user agent and window size
-        - Sets page load strategy for faster navigation
+        The runtime applies the common Chrome flags (sandbox, shared memory,
+        GPU, user agent and window size); this scraper asks for eager page
+        loads and passes its own flags, such as disabled extensions and images.
         
         Raises:
             Exception: If driver initialization fails
         """
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-        
-        # Core performance optimizations - reduce resource usage
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-web-security")
-        chrome_options.add_argument("--disable-features=VizDisplayCompositor")
-        chrome_options.add_argument("--disable-extensions")
-        chrome_options.add_argument("--disable-plugins")
-        chrome_options.add_argument("--disable-images")  # Critical: Disable image loading for speed
-        chrome_options.add_argument("--disable-javascript-harmony-shipping")
-        chrome_options.add_argument("--disable-background-timer-throttling")
-        chrome_options.add_argument("--disable-renderer-backgrounding")
-        chrome_options.add_argument("--disable-backgrounding-occluded-windows")
-        
-        # Browser configuration
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        
-        # Faster page loading strategy
-        chrome_options.add_argument("--page-load-strategy=eager")
-        
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            # Reduce implicit wait for faster element detection
-            self.driver.implicitly_wait(1)
+            self._lease = self.pool.lease()
+            self.driver = self._lease.get()
             print("✅ Chrome driver initialized successfully")
         except Exception as e:
             print(f"❌ Driver initialization failed: {e}")
@@ -266,12 +297,12 @@ class FranklinCourseScraper:
     def search_course(self, course_code: str, term: str) -> bool:
         """Search for course with term filtering"""
         try:
-            # Format course code for URL - replace space with + but preserve *
-            search_code = course_code.replace(' ', '+')
-            if '*' not in search_code:  # Only add * if not already present
-                parts = search_code.split('+')
-                if len(parts) == 2:
-                    search_code = f"{parts[0]}*{parts[1]}"
+            # Self-Service keyword search matches the DATA*610 form
+            key = course_key(course_code)
+            if key is None:
+                print(f"⚠️  Not a course code: {course_code}")
+                return False
+            search_code = key.star
             
             # Construct search URL with term filtering
             search_url = f"{self.base_url}?keyword={search_code}"
@@ -327,35 +358,26 @@ class FranklinCourseScraper:
             except:
                 pass
             
-            # Format course code for link matching - ensure proper asterisk handling
-            search_code = course_code.replace(' ', '-')
-            if '*' not in search_code:
-                parts = search_code.split('-')
-                if len(parts) == 2:
-                    search_code = f"{parts[0]}*{parts[1]}"
+            key = course_key(course_code)
+            if key is None:
+                print(f"⚠️  Not a course code: {course_code}")
+                return False
             
             # Look for "View Available Sections" link with optimized waiting
             selectors = [
-                f"//a[contains(text(), 'View Available Sections for {search_code.upper()}')]",
-                f"//a[contains(text(), 'View Available Sections for {course_code.upper().replace(' ', '-')}')]",
+                f"//a[contains(text(), 'View Available Sections for {key.star}')]",
+                f"//a[contains(text(), 'View Available Sections for {key.dash}')]",
                 f"//a[contains(text(), 'View Available Sections')]",
                 "//a[contains(@href, 'sections') or contains(text(), 'sections')]",
                 "//button[contains(text(), 'View Available Sections')]",
                 "//*[contains(text(), 'View Available Sections')]"
             ]
             
-            link_element = None
-            for selector in selectors:
-                try:
-                    # Faster element detection with shorter timeout
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    if elements:
-                        link_element = elements[0]
-                        # Check if element is immediately clickable
-                        if link_element.is_displayed() and link_element.is_enabled():
-                            break
-                except:
-                    continue
+            # Zero-wait probing: this course's two links first, then the generic
+            # selectors with the last winner on this page ahead of the rest
+            link_element = self.selectors.find(self.driver, 'view_sections', selectors,
+                                               accept=lambda e: e.is_displayed() and e.is_enabled(),
+                                               specific=2)
             
             if not link_element:
                 return True
@@ -371,16 +393,17 @@ class FranklinCourseScraper:
             start_wait = time.time()
             max_wait = 5.0  # Increased from 2.0 to 5.0 seconds
             
-            while time.time() - start_wait < max_wait:
-                try:
-                    section_tables = self.driver.find_elements(By.CLASS_NAME, "search-sectiontable")
-                    term_headers = self.driver.find_elements(By.XPATH, "//h4[contains(text(), 'Spring') or contains(text(), 'Fall') or contains(text(), 'Summer')]")
-                    
-                    if len(section_tables) > 0 or len(term_headers) > 0:
-                        return True
-                    time.sleep(0.2)  # Check every 200ms
-                except:
-                    time.sleep(0.2)
+            with zero_implicit_wait(self.driver, IMPLICIT_WAIT):
+                while time.time() - start_wait < max_wait:
+                    try:
+                        section_tables = self.driver.find_elements(By.CLASS_NAME, "search-sectiontable")
+                        term_headers = self.driver.find_elements(By.XPATH, "//h4[contains(text(), 'Spring') or contains(text(), 'Fall') or contains(text(), 'Summer')]")
+                        
+                        if len(section_tables) > 0 or len(term_headers) > 0:
+                            return True
+                        time.sleep(0.2)  # Check every 200ms
+                    except:
+                        time.sleep(0.2)
             
             return True
             
@@ -391,8 +414,8 @@ class FranklinCourseScraper:
     def extract_course_info(self, course_code: str, term: str) -> List[CourseSection]:
         """Extract detailed course information"""
         try:
-            # Remove asterisk for course info extraction
-            display_code = course_code.replace('*', ' ').strip()
+            key = course_key(course_code)
+            display_code = key.display if key else course_code
             
             soup = BeautifulSoup(self.driver.page_source, 'html.parser')
             sections = []
@@ -442,12 +465,9 @@ class FranklinCourseScraper:
             'prerequisites': ''
         }
         
-        # Clean course name for matching
-        clean_name = course_name.replace('*', ' ').strip()
-        parts = clean_name.split()
-        if len(parts) >= 2:
-            dept = parts[0].upper()
-            num = parts[1]
+        key = course_key(course_name)
+        if key:
+            dept, num = key.subject, key.number
             patterns = [
                 lambda t: t and f"{dept}-{num}" in t.upper() and 'Credits' in t,
                 lambda t: t and f"{dept} {num}" in t.upper() and 'Credits' in t,
@@ -478,6 +498,7 @@ class FranklinCourseScraper:
     def extract_sections_for_term(self, soup, term_header, term, course_info, course_name):
         """Extract all course sections for specific term"""
         sections = []
+        key = course_key(course_name)
         
         current_element = term_header
         
@@ -489,29 +510,12 @@ class FranklinCourseScraper:
             if current_element.name == 'h4' and any(t in current_element.get_text() for t in ['Spring', 'Summer', 'Fall', 'Winter']):
                 break
             
-            # Format course name for matching - ensure proper asterisk handling
-            search_name = course_name.replace(' ', '*')
-            if '*' not in search_name:
-                parts = search_name.split('*')
-                if len(parts) == 2:
-                    search_name = f"{parts[0]}*{parts[1]}"
-            
-            # Find course section links - more flexible matching
-            course_patterns = [
-                search_name.upper(),
-                course_name.upper().replace(' ', '*'),
-                course_name.upper().replace(' ', '-'),
-                course_name.upper().replace(' ', ''),
-                course_name.split()[0].upper() if ' ' in course_name else course_name.upper()
-            ]
-            
-            for pattern in course_patterns:
-                section_links = current_element.find_all('a', string=lambda t: t and pattern in t.upper())
-                if section_links:
-                    for link in section_links:
-                        section_info = self.extract_section_details(link, soup, term, course_info)
-                        if section_info:
-                            sections.append(section_info)
+            # Section links whose code parses to this course, in any spelling
+            section_links = current_element.find_all('a', string=lambda t: t and course_key(t) is key)
+            for link in section_links:
+                section_info = self.extract_section_details(link, soup, term, course_info)
+                if section_info:
+                    sections.append(section_info)
         
         return sections
     
@@ -521,11 +525,9 @@ class FranklinCourseScraper:
             full_section_code = link_elem.get_text(strip=True)
             
             # Parse section code: "DATA*610-Q1FF" -> course_code="DATA*610", session_code="Q1FF"
-            if '-' in full_section_code:
-                course_code, session_code = full_section_code.split('-', 1)
-            else:
-                course_code = full_section_code
-                session_code = ""
+            key = course_key(full_section_code)
+            course_code = key.star if key else full_section_code
+            session_code = full_section_code.split('-', 1)[1] if '-' in full_section_code else ""
             
             table = link_elem.find_parent('table')
             if not table:
@@ -806,8 +808,16 @@ class FranklinCourseScraper:
         # Return the first three-digit number found, or empty string if none
         return matches[0] if matches else ""
     
-    def save_to_excel(self, sections: List[CourseSection], filename: str = "on-campus_courses.xlsx"):
-        """Save course information to Excel file with fresh sheet creation"""
+    def save_to_excel(self, sections: List[CourseSection], filename: str = "on-campus_courses.xlsx",
+                      keep_days: int = DAILY_SHEET_RETENTION):
+        """
+        Save course information to Excel in a single load/save pass.
+        
+        The workbook is opened once; the day's sheet is rebuilt in memory (rows
+        appended, table style, column widths, frozen panes and the plan sheet's
+        change highlighting), daily sheets beyond `keep_days` are archived, and the
+        file is written once at the end.
+        """
         try:
             print(f"💾 Saving course information to {filename}...")
             
@@ -818,58 +828,39 @@ class FranklinCourseScraper:
             # Clean sheet name (remove special characters and limit length)
             sheet_name = re.sub(r'[\\/*?:"<>|]', '', sheet_name)[:31]  # Excel limits sheet names to 31 chars
             
-            # Check if file exists and preserve Note and Recitation data from existing sheet
             file_exists = os.path.exists(filename)
-            existing_notes = {}  # key: course_code|session_code, value: {'note': '', 'recitation': ''}
-            original_sheet_index = None  # Store original position
+            wb = load_workbook(filename) if file_exists else Workbook()
+            if not file_exists:
+                wb.remove(wb.active)  # drop the default empty sheet
+                print(f"📄 Creating new file...")
+            
+            # Note and Recitation are kept in the annotation store; first pick up
+            # any edits made in the newest daily sheet of the loaded workbook
+            annotations = AnnotationStore(os.path.splitext(filename)[0] + ANNOTATIONS_SUFFIX)
+            daily = self.daily_sheets(wb)
+            if daily:
+                harvested = annotations.harvest(wb[daily[-1][1]])
+                print(f"📝 Harvested Note/Recitation from '{daily[-1][1]}' ({harvested} rows, "
+                      f"{len(annotations)} annotated sections stored)")
             
-            if file_exists:
+            original_sheet_index = None  # Store original position
+            if sheet_name in wb.sheetnames:
+                print(f"📄 Replacing existing sheet '{sheet_name}'...")
+                original_sheet_index = wb.index(wb[sheet_name])
+                wb.remove(wb[sheet_name])
+            
+            # Helper function to safely convert to int, return None for N/A
+            def safe_int(value):
+                if value == 'N/A' or not value or not str(value).isdigit():
+                    return None
                 try:
-                    # Read existing data to preserve Note and Recitation columns
-                    wb = load_workbook(filename)
-                    if sheet_name in wb.sheetnames:
-                        print(f"📄 Found existing sheet '{sheet_name}', preserving Note/Recitation data...")
-                        
-                        # Store the original position of the sheet
-                        original_sheet_index = wb.index(wb[sheet_name])
-                        print(f"📍 Original sheet position: {original_sheet_index}")
-                        
-                        # Read existing data with pandas
-                        existing_df = pd.read_excel(filename, sheet_name=sheet_name)
-                        
-                        # Extract Note and Recitation data
-                        if 'Course_Code' in existing_df.columns and 'Session_Code' in existing_df.columns:
-                            for _, row in existing_df.iterrows():
-                                key = f"{row.get('Course_Code', '')}|{row.get('Session_Code', '')}"
-                                existing_notes[key] = {
-                                    'note': row.get('Note', ''),
-                                    'recitation': row.get('Recitation', '')
-                                }
-                        print(f"📝 Preserved data for {len(existing_notes)} existing sections")
-                        
-                        # Now remove the existing sheet
-                        wb.remove(wb[sheet_name])
-                        wb.save(filename)
-                        print(f"🗑️  Removed existing sheet '{sheet_name}'")
-                    
-                    print(f"📄 Creating new sheet '{sheet_name}'...")
-                except Exception as e:
-                    print(f"⚠️  Could not preserve existing data: {e}")
-            else:
-                print(f"📄 Creating new file...")
+                    return int(value)
+                except:
+                    return None
             
             # Prepare new data
             new_data = []
             for section in sections:
-                # Helper function to safely convert to int, return None for N/A
-                def safe_int(value):
-                    if value == 'N/A' or not value or not str(value).isdigit():
-                        return None
-                    try:
-                        return int(value)
-                    except:
-                        return None
-                
                 # Calculate enrolled seats: Total - Available (as integer)
                 enrolled_seats = None
                 try:
@@ -879,10 +870,6 @@ class FranklinCourseScraper:
                 except:
                     enrolled_seats = None
                 
-                # Get preserved Note and Recitation data for this section
-                section_key = f"{section.course_code}|{section.session_code}"
-                preserved_data = existing_notes.get(section_key, {'note': '', 'recitation': ''})
-                
                 # Convert classroom number to integer if it's a valid 3-digit number
                 classroom_num = self.extract_classroom_number(section.locations)
                 classroom_value = safe_int(classroom_num) if classroom_num else None
@@ -902,68 +889,46 @@ class FranklinCourseScraper:
                     'Teaching_Mode': section.teaching_mode,
                     'Start_Date': section.start_date,
                     'End_Date': section.end_date,
-                    'Note': preserved_data['note'],  # Use preserved data
                     'First_Term': 'Yes' if section.is_first_term else 'No',  # String values
-                    'Recitation': preserved_data['recitation']  # Use preserved data
                 })
             
-            new_df = pd.DataFrame(new_data)
+            # Join preserved Note/Recitation onto the generated rows in one merge
+            new_df = annotations.merge(pd.DataFrame(new_data, columns=[c for c in EXCEL_COLUMNS
+                                                                          if c not in ('Note', 'Recitation')]),
+                                       EXCEL_COLUMNS)
             
-            # Create new sheet at the original position
-            if file_exists:
-                # Use openpyxl directly for better position control
-                wb = load_workbook(filename)
-                if original_sheet_index is not None:
-                    # Create sheet at the original position
-                    new_ws = wb.create_sheet(sheet_name, original_sheet_index)
-                    print(f"📍 Created sheet at original position {original_sheet_index}")
-                else:
-                    # Add to existing file (new sheet will be at the end)
-                    new_ws = wb.create_sheet(sheet_name)
-                
-                # Write data to the worksheet
-                # First write headers
-                for c_idx, header in enumerate(new_df.columns, 1):
-                    new_ws.cell(row=1, column=c_idx, value=header)
-                
-                # Then write all data rows
-                for r_idx, row in enumerate(new_df.itertuples(index=False), 2):  # Start from row 2
-                    for c_idx, value in enumerate(row, 1):
-                        new_ws.cell(row=r_idx, column=c_idx, value=value)
-                
-                wb.save(filename)
+            # Create the sheet at its original position (or at the end) and append rows
+            if original_sheet_index is not None:
+                ws = wb.create_sheet(sheet_name, original_sheet_index)
+                print(f"📍 Created sheet at original position {original_sheet_index}")
             else:
-                # Create new file
-                with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-                    new_df.to_excel(writer, sheet_name=sheet_name, index=False)
+                ws = wb.create_sheet(sheet_name)
             
-            print(f"✅ Created new data in {filename} (Sheet: {sheet_name})")
+            ws.append(list(new_df.columns))
+            # Missing numbers stay empty cells rather than NaN
+            for row in new_df.astype(object).where(new_df.notna(), None).itertuples(index=False):
+                ws.append(list(row))
+            
+            # Styling and plan comparison happen on the in-memory workbook
+            self.format_excel_table(wb, ws, new_df)
+            self.highlight_plan_changes(wb, term, new_df)
+            archived = self.rotate_daily_sheets(wb, keep_days)
             
-            # Apply Excel formatting
-            self.format_excel_table(filename, sheet_name)
+            wb.save(filename)
+            # Only once the workbook no longer holds them, so a failed save can't archive twice
+            self.archive_daily_sheets(archived, filename, keep_days)
+            annotations.save()
+            print(f"✅ Created new data in {filename} (Sheet: {sheet_name})")
                 
         except Exception as e:
             print(f"❌ Failed to save Excel file: {e}")
     
-    def format_excel_table(self, filename: str, sheet_name: str):
-        """Format Excel sheet as a table with auto-adjusted column widths"""
+    def format_excel_table(self, wb, ws, data: pd.DataFrame):
+        """Format an in-memory sheet as a table with auto-adjusted column widths"""
         try:
-            from openpyxl import load_workbook
-            from openpyxl.worksheet.table import Table, TableStyleInfo
-            from openpyxl.utils import get_column_letter
-            
-            # Load the workbook and worksheet
-            wb = load_workbook(filename)
-            ws = wb[sheet_name]
-            
-            # Remove existing tables from the worksheet to avoid conflicts
-            tables_to_remove = list(ws.tables.keys())
-            for table_name in tables_to_remove:
-                del ws.tables[table_name]
-            
-            # Get the data range
-            max_row = ws.max_row
-            max_col = ws.max_column
+            sheet_name = ws.title
+            max_row = len(data) + 1
+            max_col = len(data.columns)
             
             if max_row > 1:  # Ensure there's data beyond headers
                 # Create table range (A1 to last cell with data)
@@ -978,9 +943,9 @@ class FranklinCourseScraper:
                 # Ensure table name is unique across the entire workbook
                 counter = 1
                 original_table_name = table_name
-                existing_table_names = []
+                existing_table_names = set()
                 for worksheet in wb.worksheets:
-                    existing_table_names.extend([table.name for table in worksheet.tables.values()])
+                    existing_table_names.update(worksheet.tables.keys())
                 
                 while table_name in existing_table_names:
                     table_name = f"{original_table_name}_{counter}"
@@ -1006,133 +971,141 @@ class FranklinCourseScraper:
                 ws.add_table(table)
                 print(f"📊 Created table '{table_name}' with range {table_range}")
             
-            # Auto-adjust column widths
-            for column_cells in ws.columns:
-                length = max(len(str(cell.value or "")) for cell in column_cells)
+            # Auto-adjust column widths from the data itself rather than re-reading cells
+            for c_idx, column in enumerate(data.columns, 1):
+                values = data[column].dropna().astype(str)
+                length = max([len(str(column))] + values.str.len().tolist())
                 # Set minimum width of 12 and maximum of 50
                 adjusted_width = max(12, min(length + 2, 50))
-                ws.column_dimensions[get_column_letter(column_cells[0].column)].width = adjusted_width
+                ws.column_dimensions[get_column_letter(c_idx)].width = adjusted_width
             
             # Freeze the first two columns
             ws.freeze_panes = 'C1'  # Freeze everything to the left of column C (i.e., freeze columns A and B)
-            
-            # Save the workbook
-            wb.save(filename)
             print(f"📊 Applied Excel table formatting with auto-adjusted column widths and frozen first two columns")
             
-            # Apply conditional formatting to compare with plan sheet
-            self.apply_conditional_formatting(filename, sheet_name)
-            
         except Exception as e:
             print(f"⚠️  Could not apply table formatting: {e}")
             import traceback
             print(f"⚠️  Error details: {traceback.format_exc()}")
             # Don't fail the entire operation if formatting fails
     
-    def apply_conditional_formatting(self, filename: str, sheet_name: str):
+    def highlight_plan_changes(self, wb, term: str, data: pd.DataFrame) -> Optional[ChangeSet]:
         """
-        Apply conditional formatting to highlight differences from plan sheet.
+        Diff the term's plan sheet against the scraped data and mark it up.
         
-        Uses simplified formulas that properly handle None/NaN values for reliable
-        change detection across all monitored columns. Applies highlighting to the
-        PLAN sheet so users can see which planned values differ from current data.
+        The comparison runs here in Python (see plan_diff) and is rendered as
+        static fills on the PLAN sheet: yellow for planned values that differ
+        from current data, red for planned sections no longer offered. Nothing
+        is left for Excel to recompute when the workbook is opened.
         
         Args:
-            filename (str): Excel file path
-            sheet_name (str): Data sheet name to compare against
+            wb: Loaded openpyxl workbook (modified in place, caller saves)
+            term (str): Academic term, e.g. "Fall 2025" -> sheet "Fall 2025 Plan"
+            data (pd.DataFrame): Rows written to the new data sheet
+        
+        Returns:
+            ChangeSet or None when there is no plan sheet
         """
         try:
-            from openpyxl import load_workbook
-            from openpyxl.styles import PatternFill
-            from openpyxl.formatting.rule import FormulaRule
-            
-            # Load workbook
-            wb = load_workbook(filename)
-            
-            # Extract term and year from data sheet name
-            # "Fall 2025_20250528" → term="Fall", year="2025"
-            term, year = self.parse_sheet_name_for_comparison(sheet_name)
-            if not term or not year:
-                print(f"⚠️  Could not parse term/year from sheet name: {sheet_name}")
-                return
-            
-            # Find corresponding plan sheet
-            plan_sheet_name = f"{term} {year} Plan"
+            plan_sheet_name = f"{term} Plan"
             if plan_sheet_name not in wb.sheetnames:
                 print(f"📋 No plan sheet found: {plan_sheet_name}")
-                return
-            
-            # Apply formatting to the PLAN sheet (not the data sheet)
+                return None
             plan_ws = wb[plan_sheet_name]
             
-            print(f"🔍 Applying conditional formatting to plan sheet: {plan_sheet_name}")
-            print(f"🔍 Comparing against data sheet: {sheet_name}")
-            
-            # Define columns to compare with their names
-            comparison_columns = {
-                'E': 'Enrolled_Seats',
-                'F': 'Total_Seats', 
-                'G': 'Waitlist',
-                'H': 'Weekdays',
-                'I': 'Class_Times',
-                'J': 'Classroom',
-                'K': 'Instructors',
-                'L': 'Teaching_Mode'
-            }
-            
-            # Create yellow fill for differences
-            yellow_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
-            
-            # Get data range from plan sheet (skip header row)
-            max_row = plan_ws.max_row
-            
-            # Apply conditional formatting to highlight plan values that differ from data
-            for col_letter, col_name in comparison_columns.items():
-                try:
-                    # Formula compares plan sheet cell against corresponding data sheet cell
-                    # Highlights when plan value differs from current data
-                    formula = f"={col_letter}2<>'{sheet_name}'!{col_letter}2"
-                    
-                    # Apply conditional formatting rule to plan sheet
-                    rule = FormulaRule(formula=[formula], fill=yellow_fill)
-                    range_to_format = f"{col_letter}2:{col_letter}{max_row}"
-                    plan_ws.conditional_formatting.add(range_to_format, rule)
-                    
-                    print(f"  ✅ Added conditional formatting for {col_name} (column {col_letter})")
-                    
-                except Exception as e:
-                    print(f"  ⚠️  Failed to add formatting for {col_name}: {e}")
-            
-            # Save workbook
-            wb.save(filename)
-            print(f"🎨 Applied conditional formatting to plan sheet '{plan_sheet_name}'")
-            print(f"💡 Plan sheet will now highlight values that differ from current data")
+            rows = plan_ws.iter_rows(values_only=True)
+            header = list(next(rows, ()))
+            if not all(key in header for key in DIFF_KEYS):
+                print(f"⚠️  Plan sheet '{plan_sheet_name}' has no Course_Code/Session_Code columns")
+                return None
+            plan_df = pd.DataFrame(list(rows), columns=header)
+            
+            changes = diff_sections(plan_df, data)
+            print(f"🔍 Plan vs. current data: {changes.summary()}")
+            
+            # Formula rules left by earlier versions reference daily sheets that get rotated away
+            kept_rules = ConditionalFormattingList()
+            for cf in plan_ws.conditional_formatting:
+                for rule in cf.rules:
+                    if not any(DAILY_SHEET_REFERENCE.search(f) for f in (rule.formula or [])):
+                        kept_rules.add(str(cf.sqref), rule)
+            plan_ws.conditional_formatting = kept_rules
+            
+            # Reset the monitored cells, then paint this run's differences
+            columns = {name: idx for idx, name in enumerate(header, 1)}
+            marked = [columns[f] for f in changes.fields] + [columns[k] for k in DIFF_KEYS]
+            removed = set(changes.removed)
+            for r_idx, row in enumerate(plan_df[DIFF_KEYS].itertuples(index=False), 2):
+                key = tuple('' if v is None else str(v).strip() for v in row)
+                for c_idx in marked:
+                    plan_ws.cell(row=r_idx, column=c_idx).fill = NO_FILL
+                if key in removed:
+                    for name in DIFF_KEYS:
+                        plan_ws.cell(row=r_idx, column=columns[name]).fill = REMOVED_FILL
+                for name in changes.changed.get(key, []):
+                    plan_ws.cell(row=r_idx, column=columns[name]).fill = CHANGED_FILL
+            
+            print(f"🎨 Highlighted plan sheet '{plan_sheet_name}' against current data")
+            if changes.added:
+                print(f"🆕 Not in plan: {', '.join(session for _, session in changes.added)}")
+            return changes
             
         except Exception as e:
-            print(f"⚠️  Could not apply conditional formatting: {e}")
+            print(f"⚠️  Could not compare with plan sheet: {e}")
             import traceback
             print(f"⚠️  Error details: {traceback.format_exc()}")
+            return None
     
-    def parse_sheet_name_for_comparison(self, sheet_name: str):
-        """Parse sheet name to extract term and year"""
-        try:
-            # Handle formats like "Fall 2025_20250528"
-            if '_' in sheet_name:
-                base_name = sheet_name.split('_')[0]  # "Fall 2025"
-            else:
-                base_name = sheet_name  # "Fall 2025 Plan"
-            
-            # Split into term and year
-            parts = base_name.strip().split()
-            if len(parts) >= 2:
-                term = parts[0]  # "Fall"
-                year = parts[1]  # "2025" 
-                return term, year
-            
-        except Exception as e:
-            print(f"⚠️  Error parsing sheet name '{sheet_name}': {e}")
+    def daily_sheets(self, wb) -> List[Tuple[str, str]]:
+        """(YYYYMMDD, sheet_name) for every daily data sheet, oldest first"""
+        daily = []
+        for name in wb.sheetnames:
+            match = DAILY_SHEET_PATTERN.match(name)
+            if match and not name.endswith(' Plan'):
+                daily.append((match.group(2), name))
+        return sorted(daily)
+    
+    def rotate_daily_sheets(self, wb, keep_days: int = DAILY_SHEET_RETENTION) -> pd.DataFrame:
+        """
+        Keep the newest `keep_days` daily sheets; drop the rest from the workbook.
+        
+        The dropped rows are returned (HISTORY_COLUMNS, tagged with the source
+        sheet name and snapshot date) for archive_daily_sheets() to write once
+        the workbook has been saved, so the workbook stays a constant size for
+        the whole term while nothing is lost.
         
-        return None, None
+        Args:
+            wb: Loaded openpyxl workbook (modified in place, caller saves)
+            keep_days (int): Number of daily sheets to keep
+        """
+        daily = self.daily_sheets(wb)
+        expired = daily[:max(0, len(daily) - keep_days)]
+        frames = []
+        for snapshot_date, name in expired:
+            rows = wb[name].iter_rows(values_only=True)
+            header = [str(h) if h is not None else '' for h in next(rows, ())]
+            sheet = pd.DataFrame([list(row) for row in rows], columns=header or None)
+            sheet = sheet.loc[:, [c for c in sheet.columns if c in EXCEL_COLUMNS]]
+            sheet.insert(0, 'Snapshot_Date', snapshot_date)
+            sheet.insert(0, 'Sheet', name)
+            frames.append(sheet.reindex(columns=HISTORY_COLUMNS))
+            wb.remove(wb[name])
+        if not frames:
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
+    
+    def archive_daily_sheets(self, archived: pd.DataFrame, filename: str,
+                             keep_days: int = DAILY_SHEET_RETENTION):
+        """Append rows returned by rotate_daily_sheets() to <workbook>_history.csv.gz"""
+        if archived.empty:
+            return
+        history_path = os.path.splitext(filename)[0] + HISTORY_SUFFIX
+        new_file = not os.path.exists(history_path)
+        # Appending opens a new gzip member; readers see one continuous CSV
+        with gzip.open(history_path, 'at', newline='', encoding='utf-8') as f:
+            archived.to_csv(f, header=new_file, index=False)
+        print(f"🗄️  Archived {archived['Sheet'].nunique()} daily sheets ({len(archived)} rows) "
+              f"to {history_path}, keeping the newest {keep_days}")
     
     def scrape_course(self, course_code: str, term: str) -> List[CourseSection]:
         """Complete course scraping workflow for single course"""
@@ -1142,12 +1115,12 @@ class FranklinCourseScraper:
             # Performance monitoring
             start_time = time.time()
             
-            # Format course code consistently
-            formatted_code = course_code
-            if '*' not in formatted_code:
-                parts = formatted_code.split()
-                if len(parts) == 2:
-                    formatted_code = f"{parts[0]}*{parts[1]}"
+            # Canonical DATA*610 form, parsed once from whatever spelling was configured
+            key = course_key(course_code)
+            if key is None:
+                print(f"⚠️  Not a course code: {course_code}, skipping")
+                return []
+            formatted_code = key.star
             
             if not self.search_course(formatted_code, term):
                 return []
@@ -1183,22 +1156,8 @@ class FranklinCourseScraper:
         
         print(f"📚 Processing {len(course_request.courses)} courses for term: {course_request.term}")
         
-        # Create a map of course codes to their first_term status
-        # Use multiple formats to handle format conversions between configuration and Franklin format
-        first_term_map = {}
-        for course_code, is_first_term in course_request.courses:
-            # Add all possible variations of the course code
-            variations = [
-                course_code,  # Original: "DATA 610" 
-                course_code.upper(),  # "DATA 610"
-                course_code.replace(' ', '*'),  # "DATA*610"
-                course_code.replace(' ', '*').upper(),  # "DATA*610"
-                course_code.replace(' ', ''),  # "DATA610"
-                course_code.replace(' ', '').upper(),  # "DATA610"
-            ]
-            
-            for variation in variations:
-                first_term_map[variation] = is_first_term
+        # First-term status per canonical course key ("DATA 610", "DATA*610", ... all hit the same entry)
+        first_term_map = CourseIndex(course_request.courses)
         
         for i, (course_code, is_first_term) in enumerate(course_request.courses):
             try:
@@ -1206,19 +1165,7 @@ class FranklinCourseScraper:
                 if sections:
                     # Update First_Term for all sections of this course
                     for section in sections:
-                        # Try multiple formats to find the first_term status
-                        course_variations = [
-                            section.course_code,  # e.g., "DATA*610"
-                            section.course_code.replace('*', ' '),  # e.g., "DATA 610"
-                            section.course_code.upper(),  # e.g., "DATA*610"
-                            section.course_code.replace('*', ' ').upper()  # e.g., "DATA 610"
-                        ]
-                        
-                        section.is_first_term = False  # Default
-                        for variation in course_variations:
-                            if variation in first_term_map:
-                                section.is_first_term = first_term_map[variation]
-                                break
+                        section.is_first_term = first_term_map.get(section.course_code, False)
                     all_sections.extend(sections)
                     print(f"✅ {course_code}: {len(sections)} sections found {'(First Term)' if is_first_term else ''}")
                 else:
@@ -1234,9 +1181,10 @@ class FranklinCourseScraper:
         return all_sections
     
     def close(self):
-        """Close browser"""
-        if self.driver:
-            self.driver.quit()
+        """Close browser and print run metrics (including selector hit rates)"""
+        self.pool.close()
+        self.driver = None
+        self.metrics.report()
 
 
 def main():
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Plan-vs-Actual Section Diff Engine
+
+Aligns a term's plan sheet with freshly scraped sections on their
+Course_Code/Session_Code keys and compares the monitored fields column by
+column, producing a ChangeSet (added, removed, and which fields changed per
+section) that exporters render however they like.
+
+Author: Course Category Project
+Version: 1.0
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from course_key import star_code
+
+DIFF_KEYS = ['Course_Code', 'Session_Code']
+
+# Fields whose plan value is checked against the scraped value
+COMPARED_FIELDS = [
+    'Enrolled_Seats', 'Total_Seats', 'Waitlist', 'Weekdays',
+    'Class_Times', 'Classroom', 'Instructors', 'Teaching_Mode'
+]
+
+SectionKey = Tuple[str, str]
+
+
+@dataclass
+class ChangeSet:
+    """
+    Differences between a plan and the scraped data.
+
+    Attributes:
+        added (List[SectionKey]): Sections scraped but not in the plan
+        removed (List[SectionKey]): Planned sections no longer offered
+        changed (Dict[SectionKey, List[str]]): Fields that differ, per section
+        fields (List[str]): Fields that were compared
+    """
+    added: List[SectionKey] = field(default_factory=list)
+    removed: List[SectionKey] = field(default_factory=list)
+    changed: Dict[SectionKey, List[str]] = field(default_factory=dict)
+    fields: List[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    def summary(self) -> str:
+        return (f"{len(self.added)} added, {len(self.removed)} removed, "
+                f"{len(self.changed)} changed")
+
+    def to_dict(self) -> dict:
+        """JSON-ready form: keys as 'COURSE|SESSION' strings"""
+        return {
+            'added': ['|'.join(key) for key in self.added],
+            'removed': ['|'.join(key) for key in self.removed],
+            'changed': {'|'.join(key): fields for key, fields in self.changed.items()},
+            'fields': self.fields,
+        }
+
+
+def _normalize(values: pd.Series) -> pd.Series:
+    """Comparable text: blanks/None/NaN -> '', whole numbers without '.0', trimmed"""
+    text = values.astype(object).where(values.notna(), '').astype(str).str.strip()
+    numbers = pd.to_numeric(text, errors='coerce')
+    whole = numbers.notna() & (numbers == numbers.round())
+    text[whole] = numbers[whole].astype('int64').astype(str)
+    return text
+
+
+def diff_sections(plan: pd.DataFrame, actual: pd.DataFrame,
+                  fields: List[str] = None) -> ChangeSet:
+    """
+    Compare plan rows to scraped rows, aligned on DIFF_KEYS.
+
+    Each key is matched once (first occurrence wins); fields missing from
+    either side are skipped.
+
+    Args:
+        plan (pd.DataFrame): Plan sheet rows
+        actual (pd.DataFrame): Scraped rows
+        fields (List[str]): Fields to compare (default COMPARED_FIELDS)
+
+    Returns:
+        ChangeSet: Added, removed and changed sections
+    """
+    fields = [f for f in (fields or COMPARED_FIELDS) if f in plan.columns and f in actual.columns]
+
+    def keyed(frame):
+        frame = frame.dropna(subset=DIFF_KEYS)
+        frame = frame.assign(**{key: _normalize(frame[key]) for key in DIFF_KEYS})
+        # Plan sheets written before the DATA*610 form still key on "PF-521*Advanced"
+        frame['Course_Code'] = frame['Course_Code'].map(star_code)
+        return frame.drop_duplicates(DIFF_KEYS)[DIFF_KEYS + fields]
+
+    merged = keyed(plan).merge(keyed(actual), on=DIFF_KEYS, how='outer',
+                               suffixes=('_plan', '_actual'), indicator=True)
+    keys = list(zip(merged['Course_Code'], merged['Session_Code']))
+
+    changes = ChangeSet(fields=fields)
+    changes.removed = [k for k, side in zip(keys, merged['_merge']) if side == 'left_only']
+    changes.added = [k for k, side in zip(keys, merged['_merge']) if side == 'right_only']
+
+    both = merged['_merge'] == 'both'
+    if fields and both.any():
+        # One vectorized comparison per field across all matched sections
+        differs = pd.DataFrame({f: _normalize(merged[f + '_plan']) != _normalize(merged[f + '_actual'])
+                                for f in fields})
+        differs = differs[both & differs.any(axis=1)]
+        for row, flags in zip(differs.index, differs.to_numpy()):
+            changes.changed[keys[row]] = [f for f, flag in zip(fields, flags) if flag]
+    return changes
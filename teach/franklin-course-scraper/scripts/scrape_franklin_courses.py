@@ -6,6 +6,17 @@ Franklin University Course Scraper - Data Collection Script
 A streamlined data collection script that extracts course information
 and outputs clean CSV data for downstream analysis.
 
+Subcommands (default: fetch):
+    fetch   scrape live pages, archive them under data/pages/<date>/, write CSV
+    parse   re-extract the CSV from archived pages (no browser)
+    export  convert the CSV to JSON or Excel
+    stats   summarize the CSV via the precomputed analytics artifact
+    watch   poll seats at adaptive intervals, logging changes to data/seat_watch.jsonl
+    events  print or follow the section change event stream
+
+selenium, BeautifulSoup and pandas are imported on first use, so the offline
+subcommands never load the browser stack.
+
 Author: Course Analytics Project  
 Version: 5.0 (Data Collection Focused)
 """
@@ -14,21 +25,29 @@ import time
 import os
 import re
 import csv
-from datetime import datetime
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+import json
+import contextlib
+import multiprocessing
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone, timedelta
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Union
 from pathlib import Path
-import pandas as pd
 import sys
+import argparse
+
+# The browser runtime is shared with posts/job_listing from <repo>/shared
+sys.path.insert(0, str(Path(__file__).resolve().parents[3] / 'shared'))
+from course_key import CourseIndex, course_key
+from scraping_runtime import (DriverConfig, DriverPool, NetworkCapture, RateLimiter, RunMetrics, SelectorCache,
+                              retry, zero_implicit_wait)
+from section_events import EVENT_TYPES, EventStream, subscribe
+from seat_watch import MAX_INTERVAL, MIN_INTERVAL, REQUEST_BUDGET, SeatWatcher
+from selfservice_api import (DEFAULT_WORKERS as DISCOVERY_WORKERS, SECTION_IDS_MAX_AGE, SECTIONS_PATH,
+                             SelfServiceClient, discover_courses)
 
 # Fix Windows console encoding issue for emoji characters
 if sys.platform == 'win32':
@@ -38,9 +57,9 @@ if sys.platform == 'win32':
 
 # Compiled regex patterns for better performance
 SECTION_PATTERN = re.compile(r'[a-z]+\*\d+-[a-z0-9]{4}', re.IGNORECASE)
-COURSE_FORMAT_PATTERN = re.compile(r'^([A-Za-z]+)\s+(\d+)', re.IGNORECASE)
 DATE_PATTERN = re.compile(r'\d{1,2}/\d{1,2}/\d{4}')
 TIME_PATTERN = re.compile(r'\d{1,2}:\d{2}\s*[AP]M', re.IGNORECASE)
+DEFAULT_SESSION_PATTERNS = ['FF']  # face-to-face sections only, e.g. PF*521-F1FF
 
 # Weekday mapping for Franklin University formats
 WEEKDAY_MAPPING = {
@@ -61,6 +80,31 @@ DEFAULT_WEEKDAY = 'TBD'
 # Browser settings
 BROWSER_WAIT_TIMEOUT = 10.0  # Increased timeout to handle slow-loading courses
 INTER_COURSE_DELAY = 1  # Seconds between course scraping
+PAGE_LOAD_ATTEMPTS = 3  # Retries for transient navigation failures
+IMPLICIT_WAIT = 2  # Seconds; selector probing turns it off temporarily
+
+# Output locations
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DEFAULT_CSV = DATA_DIR / "franklin_courses.csv"
+PAGES_DIR = DATA_DIR / "pages"  # one YYYYMMDD folder of page snapshots per fetch
+SNAPSHOT_MANIFEST = "manifest.json"
+EST = timezone(timedelta(hours=-5))  # EST is UTC-5
+HISTORY_CSV = DATA_DIR / "franklin_courses_history.csv"
+CHUNKS_PER_WORKER = 4  # re-extraction work units per process, balances load vs. IPC
+MIN_PAGES_PER_WORKER = 8  # below this a process costs more to spawn than it saves
+# Pools start fresh interpreters: forking copies the parent's threads (Selenium, queues) mid-state
+POOL_START_METHOD = 'spawn'
+PIPELINE_QUEUE_SIZE = 8  # fetched pages allowed to wait for (or sit in) the parse pool
+PIPELINE_PARSE_WORKERS = 2
+WATCH_LOG = DATA_DIR / "seat_watch.jsonl"  # timestamped seat/waitlist changes from `watch`
+EVENTS_LOG = DATA_DIR / "section_events.jsonl"  # append-only change events, see section_events.py
+
+CSV_HEADERS = [
+    'Course_Code', 'Session_Code', 'Course_Name', 'Credits', 'Term',
+    'Enrolled_Seats', 'Total_Seats', 'Waitlist',
+    'Weekdays', 'Class_Times', 'Locations', 'Instructors', 
+    'Teaching_Mode', 'Start_Date', 'End_Date', 'First_Term', 'Scraped_DateTime'
+]
 
 @dataclass
 class CourseRequest:
@@ -86,38 +130,77 @@ class CourseSection:
     term: str
     is_first_term: bool = False
 
+@dataclass
+class SectionFilter:
+    """
+    Which sections to keep, checked as soon as each input is known.
+
+    First-term status is checked per course before its page is fetched, the
+    session code on the link text before any detail extraction, and teaching
+    mode/campus right after the locations are read, before the seat, time,
+    instructor and date helpers run. Empty lists accept everything.
+    """
+    session_patterns: List[str] = field(default_factory=lambda: list(DEFAULT_SESSION_PATTERNS))
+    modes: List[str] = field(default_factory=list)      # Teaching_Mode values, e.g. Face-to-Face
+    campuses: List[str] = field(default_factory=list)   # location substrings, e.g. Frasch
+    first_term_only: bool = False
+
+    def __post_init__(self):
+        self._session = (re.compile('|'.join(f'(?:{p})' for p in self.session_patterns))
+                         if self.session_patterns else None)
+        self._modes = {mode.lower() for mode in self.modes}
+        self._campuses = [campus.lower() for campus in self.campuses]
+
+    def accepts_course(self, is_first_term: bool) -> bool:
+        return is_first_term or not self.first_term_only
+
+    def accepts_code(self, session_code: str) -> bool:
+        return self._session is None or bool(self._session.search(session_code))
+
+    def accepts_placement(self, locations: List[str], teaching_mode: str) -> bool:
+        if self._modes and teaching_mode.lower() not in self._modes:
+            return False
+        if self._campuses:
+            text = ' '.join(locations).lower()
+            return any(campus in text for campus in self._campuses)
+        return True
+
 class FranklinCourseScraper:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, start_driver=True, snapshot_dir=None, capture=False,
+                 section_filter: Optional[SectionFilter] = None, fast_load=False):
         self.base_url = "https://selfservice.franklin.edu/Student/Courses/Search"
         self.driver = None
         self.headless = headless
-        self.setup_driver()
+        self.metrics = RunMetrics()
+        self.rate_limiter = RateLimiter(INTER_COURSE_DELAY)
+        # Page sources are archived here during scraping so `parse` can replay them
+        self.snapshot_dir = Path(snapshot_dir) if snapshot_dir else None
+        self.snapshots = []
+        # Courses whose section listing was retrieved, even if empty; only these
+        # are complete enough for change events to read missing sections as removals
+        self.loaded_courses: List[str] = []
+        self.section_filter = section_filter or SectionFilter()
+        self.pool = DriverPool(
+            DriverConfig(headless=headless, hide_automation=headless, implicit_wait=IMPLICIT_WAIT,
+                         use_webdriver_manager=True, capture_network=capture,
+                         extra_arguments=["--disable-images"],
+                         # Opt-in: stop waiting for subresources and drop images/fonts/analytics
+                         page_load_strategy="eager" if fast_load else "normal",
+                         block_resources=fast_load),
+            size=1, metrics=self.metrics)
+        self.selectors = SelectorCache(self.metrics, implicit_wait=IMPLICIT_WAIT)
+        # Section payloads captured off the wire while the UI loads them (fetch --capture)
+        self.capture = None
+        if start_driver:
+            self.setup_driver()
     
     def setup_driver(self):
-        chrome_options = Options()
-        if self.headless:
-            chrome_options.add_argument("--headless")
-            # Additional options for better headless compatibility
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-        
-        # Performance optimizations
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--disable-images")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-        
         try:
-            # Use webdriver-manager to automatically download and manage ChromeDriver
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            if self.headless:
-                # Hide automation markers
-                self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            self.driver.implicitly_wait(2)  # Slightly longer for headless
+            # Shared runtime handles Chrome options, resource blocking and shutdown
+            self._lease = self.pool.lease()
+            self.driver = self._lease.get()
+            if self.pool.config.capture_network:
+                self.capture = NetworkCapture(self.driver, self.metrics)
             mode_text = "headless" if self.headless else "windowed"
             print(f"✅ Chrome driver initialized ({mode_text} mode)")
         except Exception as e:
@@ -176,56 +259,94 @@ class FranklinCourseScraper:
             print(f"❌ Failed to read {filename}: {e}")
             return CourseRequest("", [("DATA 610", False)])
 
-    def save_to_csv(self, sections: List[CourseSection], filename: str = None):
+    def discover_course_list(self, term: str, subjects: Optional[List[str]] = None,
+                             workers: int = DISCOVERY_WORKERS,
+                             filename: str = "course_request.md",
+                             client: Optional[SelfServiceClient] = None) -> CourseRequest:
+        """Enumerate the full term catalog from Self-Service search instead of the hand list
+
+        First-term flags still come from course_request.md, so starred courses keep
+        their marking when they turn up in the discovered catalog.
+        """
+        configured = self.read_course_list(filename)
+        term = term or configured.term
+        first_term = CourseIndex((code, is_first) for code, is_first in configured.courses)
+        try:
+            with self.metrics.timed('discover'):
+                codes = discover_courses(client or SelfServiceClient(), term, subjects, workers,
+                                         rate_limiter=self.rate_limiter)
+        except Exception as e:
+            print(f"❌ Catalog discovery failed: {e}, using {filename}")
+            return configured
+        if not codes:
+            print(f"⚠️  Catalog discovery found no courses, using {filename}")
+            return configured
+        return CourseRequest(term, [(code, first_term.get(code, False)) for code in codes])
+
+    def save_snapshot(self, course_code: str, page_source: str, suffix: str = ".html"):
+        """Archive a course's sections page (or JSON payload) for offline re-extraction"""
+        self.snapshot_dir.mkdir(parents=True, exist_ok=True)
+        key = course_key(course_code)
+        # Unparseable codes still get a stable, filesystem-safe name
+        stem = f"{key.subject}_{key.number}" if key else re.sub(r'[^A-Za-z0-9]+', '_', course_code).strip('_')
+        filename = f"{stem}{suffix}"
+        (self.snapshot_dir / filename).write_text(page_source, encoding='utf-8')
+        self.snapshots.append({'course_code': course_code, 'file': filename})
+
+    def write_snapshot_manifest(self, course_request: CourseRequest):
+        """Record term, first-term flags and fetch time next to the archived pages"""
+        if not self.snapshot_dir or not self.snapshots:
+            return
+        first_term = CourseIndex(course_request.courses)
+        manifest = {
+            'term': course_request.term,
+            'fetched_at': datetime.now(EST).isoformat(),
+            'courses': [dict(entry, first_term=first_term.get(entry['course_code'], False))
+                        for entry in self.snapshots],
+        }
+        with open(self.snapshot_dir / SNAPSHOT_MANIFEST, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+        print(f"🗄️  Archived {len(self.snapshots)} pages to {self.snapshot_dir}")
+
+    @staticmethod
+    def section_row(section: CourseSection, scraped_datetime: str) -> list:
+        """One CSV row per section (no grouping/combining)"""
+        # Calculate enrolled seats: Enrolled = Total - Available
+        enrolled_seats = "N/A"
+        try:
+            if (section.seats_total != 'N/A' and section.seats_available != 'N/A' and
+                str(section.seats_total).isdigit() and str(section.seats_available).isdigit()):
+                enrolled_seats = str(int(section.seats_total) - int(section.seats_available))
+        except:
+            pass
+
+        return [
+            section.course_code, section.session_code, section.course_name,
+            section.credits, section.term, enrolled_seats,
+            section.seats_total, section.seats_waitlisted,
+            ', '.join(section.weekdays), ', '.join(section.class_times),
+            ', '.join(section.locations), ', '.join(section.instructors),
+            section.teaching_mode, section.start_date, section.end_date,
+            'Yes' if section.is_first_term else 'No', scraped_datetime
+        ]
+
+    def save_to_csv(self, sections: List[CourseSection], filename: str = None,
+                    scraped_datetime: str = None):
         try:
             if filename is None:
-                # Get the scraper directory (one level up from scripts/) then into data/
-                data_dir = os.path.join(os.path.dirname(__file__), "..", "data")
-                data_dir = os.path.abspath(data_dir)  # Convert to absolute path
-                if not os.path.exists(data_dir):
-                    os.makedirs(data_dir, exist_ok=True)
-                filename = os.path.join(data_dir, "franklin_courses.csv")
+                DATA_DIR.mkdir(parents=True, exist_ok=True)
+                filename = str(DEFAULT_CSV)
             
             print(f"💾 Saving to {filename}...")
             
-            headers = [
-                'Course_Code', 'Session_Code', 'Course_Name', 'Credits', 'Term',
-                'Enrolled_Seats', 'Total_Seats', 'Waitlist',
-                'Weekdays', 'Class_Times', 'Locations', 'Instructors', 
-                'Teaching_Mode', 'Start_Date', 'End_Date', 'First_Term', 'Scraped_DateTime'
-            ]
-            
-            # Save timestamp in EST timezone for consistency
-            from datetime import timezone, timedelta
-            est_tz = timezone(timedelta(hours=-5))  # EST is UTC-5
-            scraped_datetime = datetime.now(est_tz).isoformat()
-
-            # Create one row per section (no grouping/combining)
-            csv_data = []
-            for section in sections:
-                # Calculate enrolled seats: Enrolled = Total - Available
-                enrolled_seats = "N/A"
-                try:
-                    if (section.seats_total != 'N/A' and section.seats_available != 'N/A' and
-                        str(section.seats_total).isdigit() and str(section.seats_available).isdigit()):
-                        enrolled_seats = str(int(section.seats_total) - int(section.seats_available))
-                except:
-                    pass
-
-                row = [
-                    section.course_code, section.session_code, section.course_name,
-                    section.credits, section.term, enrolled_seats,
-                    section.seats_total, section.seats_waitlisted,
-                    ', '.join(section.weekdays), ', '.join(section.class_times),
-                    ', '.join(section.locations), ', '.join(section.instructors),
-                    section.teaching_mode, section.start_date, section.end_date,
-                    'Yes' if section.is_first_term else 'No', scraped_datetime
-                ]
-                csv_data.append(row)
+            # Save timestamp in EST timezone for consistency; re-parsed archives
+            # keep the time their pages were fetched
+            scraped_datetime = scraped_datetime or datetime.now(EST).isoformat()
+            csv_data = [self.section_row(section, scraped_datetime) for section in sections]
             
             with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
                 writer = csv.writer(csvfile)
-                writer.writerow(headers)
+                writer.writerow(CSV_HEADERS)
                 writer.writerows(csv_data)
             
             print(f"✅ Saved {len(csv_data)} sections to {filename}")
@@ -235,24 +356,32 @@ class FranklinCourseScraper:
             raise
 
     def close(self):
-        if self.driver:
-            self.driver.quit()
+        self.pool.close()
+        self.driver = None
+        self.metrics.report()
 
     def search_course(self, course_code: str, term: str) -> bool:
         """Search for course with term filtering"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException
+
         try:
-            # Format course code for URL - replace space with + but preserve *
-            search_code = course_code.replace(' ', '+')
-            if '*' not in search_code:  # Only add * if not already present
-                parts = search_code.split('+')
-                if len(parts) == 2:
-                    search_code = f"{parts[0]}*{parts[1]}"
+            # Self-Service keyword search matches the DATA*610 form
+            key = course_key(course_code)
+            if key is None:
+                print(f"⚠️  Not a course code: {course_code}")
+                return False
+            search_code = key.star
             
             # Construct search URL without term filtering (like the working reference code)
             search_url = f"{self.base_url}?keyword={search_code}"
             print(f"🔍 Searching: {course_code} (All terms)")
             
-            self.driver.get(search_url)
+            retry(lambda: self.driver.get(search_url), attempts=PAGE_LOAD_ATTEMPTS,
+                  on_error=lambda n, e: print(f"⚠️  Page load attempt {n} failed: {e}"),
+                  metrics=self.metrics)
             
             # Wait for page to load and check what we get
             try:
@@ -280,39 +409,34 @@ class FranklinCourseScraper:
 
     def click_view_sections(self, course_code: str) -> bool:
         """Click view available sections link using the proven working method"""
+        from selenium.webdriver.common.by import By
+
         try:
             # Always look for the specific course's "View Available Sections" link
             # Don't assume sections are already visible from previous searches
             
-            # Format course code for link matching - ensure proper asterisk handling
-            search_code = course_code.replace(' ', '-')
-            if '*' not in search_code:
-                parts = search_code.split('-')
-                if len(parts) == 2:
-                    search_code = f"{parts[0]}*{parts[1]}"
+            key = course_key(course_code)
+            if key is None:
+                print(f"⚠️  Not a course code: {course_code}")
+                return False
             
             # Look for "View Available Sections" link with optimized waiting
             selectors = [
-                f"//a[contains(text(), 'View Available Sections for {search_code.upper()}')]",
-                f"//a[contains(text(), 'View Available Sections for {course_code.upper().replace(' ', '-')}')]",
+                f"//a[contains(text(), 'View Available Sections for {key.star}')]",
+                f"//a[contains(text(), 'View Available Sections for {key.dash}')]",
                 f"//a[contains(text(), 'View Available Sections')]",
                 "//a[contains(@href, 'sections') or contains(text(), 'sections')]",
                 "//button[contains(text(), 'View Available Sections')]",
                 "//*[contains(text(), 'View Available Sections')]"
             ]
             
-            link_element = None
-            for selector in selectors:
-                try:
-                    elements = self.driver.find_elements(By.XPATH, selector)
-                    if elements:
-                        link_element = elements[0]
-                        # Check if element is immediately clickable
-                        if link_element.is_displayed() and link_element.is_enabled():
-                            print(f"✅ Found clickable link: {link_element.text[:50]}...")
-                            break
-                except:
-                    continue
+            # Zero-wait probing: this course's two links first, then the generic
+            # selectors with the last winner on this page ahead of the rest
+            link_element = self.selectors.find(self.driver, 'view_sections', selectors,
+                                               accept=lambda e: e.is_displayed() and e.is_enabled(),
+                                               specific=2)
+            if link_element:
+                print(f"✅ Found link: {link_element.text[:50]}...")
             
             if not link_element:
                 print("⚠️  No 'View Available Sections' link found")
@@ -342,17 +466,18 @@ class FranklinCourseScraper:
             start_wait = time.time()
             max_wait = BROWSER_WAIT_TIMEOUT if self.headless else 5.0  # Headless should be faster
             
-            while time.time() - start_wait < max_wait:
-                try:
-                    section_tables = self.driver.find_elements(By.CLASS_NAME, "search-sectiontable")
-                    term_headers = self.driver.find_elements(By.XPATH, "//h4[contains(text(), 'Spring') or contains(text(), 'Fall') or contains(text(), 'Summer')]")
-                    
-                    if len(section_tables) > 0 or len(term_headers) > 0:
-                        print(f"✅ Content loaded: {len(section_tables)} tables, {len(term_headers)} term headers")
-                        return True
-                    time.sleep(0.2)  # Check every 200ms
-                except:
-                    time.sleep(0.2)
+            with zero_implicit_wait(self.driver, IMPLICIT_WAIT):
+                while time.time() - start_wait < max_wait:
+                    try:
+                        section_tables = self.driver.find_elements(By.CLASS_NAME, "search-sectiontable")
+                        term_headers = self.driver.find_elements(By.XPATH, "//h4[contains(text(), 'Spring') or contains(text(), 'Fall') or contains(text(), 'Summer')]")
+                        
+                        if len(section_tables) > 0 or len(term_headers) > 0:
+                            print(f"✅ Content loaded: {len(section_tables)} tables, {len(term_headers)} term headers")
+                            return True
+                        time.sleep(0.2)  # Check every 200ms
+                    except:
+                        time.sleep(0.2)
             
             print("⚠️  Timeout waiting for sections to load, continuing anyway")
             return True
@@ -361,13 +486,21 @@ class FranklinCourseScraper:
             print(f"❌ Failed to click section link: {e}")
             return False
 
-    def extract_course_info(self, course_code: str, term: str) -> List[CourseSection]:
-        """Extract detailed course information using the proven working method"""
+    def extract_course_info(self, course_code: str, term: str,
+                            page_source: Optional[str] = None) -> List[CourseSection]:
+        """Extract detailed course information using the proven working method
+
+        Parses `page_source` when given (archived pages), else the live browser page.
+        """
+        from bs4 import BeautifulSoup
+
         try:
-            # Remove asterisk for course info extraction
-            display_code = course_code.replace('*', ' ').strip()
+            key = course_key(course_code)
+            display_code = key.display if key else course_code
             
-            soup = BeautifulSoup(self.driver.page_source, 'html.parser')
+            if page_source is None:
+                page_source = self.driver.page_source
+            soup = BeautifulSoup(page_source, 'html.parser')
             sections = []
             
             course_info = self.extract_basic_course_info(soup, display_code)
@@ -388,36 +521,137 @@ class FranklinCourseScraper:
             else:
                 print(f"🔍 Using all {len(term_headers)} term headers (term parameter is empty)")
             
+            # Session codes already extracted; duplicates are skipped before extraction
+            seen = set()
             for term_header in term_headers:
                 term_text = term_header.get_text(strip=True)
                 # Pass both term_text (for logging) and term (requested term for labeling)
-                term_sections = self.extract_sections_for_term(soup, term_header, term_text, course_info, course_code, requested_term=term)
+                term_sections = self.extract_sections_for_term(soup, term_header, term_text, course_info, course_code,
+                                                               requested_term=term, seen=seen)
                 sections.extend(term_sections)
             
-            # Simplified filtering: Only keep FF (face-to-face) sections
-            filtered_sections = []
-            for section in sections:
-                # Only keep FF sections (face-to-face)
-                if "FF" in section.session_code:
-                    filtered_sections.append(section)
-                    print(f"   ✅ Keeping FF section: {section.session_code}")
-                else:
-                    print(f"   ❌ Filtering out non-FF section: {section.session_code}")
-            
-            # Deduplicate sections based on course_code + session_code
-            unique_sections = {}
-            for section in filtered_sections:
-                key = f"{section.course_code}_{section.session_code}"
-                if key not in unique_sections:
-                    unique_sections[key] = section
-            
-            print(f"✅ Extracted {len(unique_sections)} sections for {course_code}")
-            return list(unique_sections.values())
+            print(f"✅ Extracted {len(sections)} sections for {course_code}")
+            return sections
             
         except Exception as e:
             print(f"❌ Course information extraction failed: {e}")
             return []
 
+    def extract_sections(self, course_code: str, term: str, page_source: str) -> List[CourseSection]:
+        """Sections from a fetched page: a captured/retrieved JSON payload or rendered HTML"""
+        if page_source.lstrip().startswith('{'):
+            try:
+                payload = json.loads(page_source)
+            except ValueError as e:
+                print(f"❌ Section payload is not valid JSON: {e}")
+                return []
+            sections = self.sections_from_payload(payload, course_code, term)
+            # An unreadable payload has already been reported; it yields no rows
+            return sections if sections is not None else []
+        return self.extract_course_info(course_code, term, page_source)
+
+    def sections_from_payload(self, payload: dict, course_code: str, term: str) -> Optional[List[CourseSection]]:
+        """
+        Build sections from the Self-Service section-listing JSON (no DOM involved)
+
+        Used by direct retrieval and by captured network responses; returns the
+        same CourseSection fields the HTML extraction produces. Returns None when
+        the payload can't be parsed (unexpected layout or field types), so a
+        failed parse is never mistaken for a course with no sections.
+        """
+        try:
+            requested = course_key(course_code)
+            groups = _payload_value(payload, 'SectionsRetrieved', default=payload)
+            # An empty list is a valid "no sections"; a missing key means the layout changed
+            groups = groups.get('TermsAndSections') if isinstance(groups, dict) else None
+            if not isinstance(groups, list):
+                raise ValueError("no TermsAndSections list")
+            sections, seen = [], set()
+            for group in groups:
+                term_text = _payload_value(group.get('Term') or {}, 'Description', default='')
+                if term and term not in term_text:
+                    continue
+                for entry in group.get('Sections', []):
+                    section = self.section_from_record(entry.get('Section', entry), requested,
+                                                       term or term_text, seen)
+                    if section:
+                        seen.add(section.session_code)
+                        sections.append(section)
+            print(f"✅ Extracted {len(sections)} sections for {course_code}")
+            return sections
+        except Exception as e:
+            print(f"❌ Section payload parsing failed for {course_code}: {e}")
+            self.metrics.count('payload.errors')
+            return None
+
+    def section_from_record(self, record: dict, requested, term: str,
+                            seen: Optional[set] = None) -> Optional[CourseSection]:
+        """One Self-Service section record -> CourseSection (None if filtered out or already seen)"""
+        name = _payload_value(record, 'SectionNameDisplay', 'SectionName', 'Name', default='')
+        key = course_key(name) or requested
+        number = _payload_value(record, 'Number', default='') or name.rsplit('-', 1)[-1]
+        if not key or not number:
+            return None
+        session_code = f"{key.star}-{number}"
+        if not self.section_filter.accepts_code(session_code) or (seen and session_code in seen):
+            self.metrics.count('filter.skipped_before_extraction')
+            return None
+        
+        capacity = _payload_value(record, 'Capacity')
+        available = _payload_value(record, 'Available')
+        waitlisted = _payload_value(record, 'Waitlisted', 'WaitlistCount', 'NumberOnWaitlist', default=0)
+        credits = _payload_value(record, 'MinimumCredits', 'Credits', 'CeusDisplay', default=DEFAULT_CREDITS)
+        
+        weekdays, class_times, locations = [], [], []
+        for meeting in _payload_value(record, 'FormattedMeetingTimes', 'Meetings', default=[]) or []:
+            start = _payload_value(meeting, 'StartTimeDisplay', 'StartTime', default='')
+            end = _payload_value(meeting, 'EndTimeDisplay', 'EndTime', default='')
+            times = f"{start} - {end}" if start and end else DEFAULT_TIME
+            days = _payload_days(_payload_value(meeting, 'DaysOfWeekDisplay', 'Days', default=''))
+            # One entry per meeting day, matching the HTML extraction
+            for day in days or [DEFAULT_WEEKDAY]:
+                weekdays.append(day)
+                class_times.append(times)
+            room = ' '.join(str(part) for part in (_payload_value(meeting, 'BuildingDisplay', 'Building', default=''),
+                                                   _payload_value(meeting, 'RoomDisplay', 'Room', default=''))
+                            if part).strip()
+            if room and room not in locations:
+                locations.append(room)
+        if not locations:
+            location = _payload_value(record, 'LocationDisplay', 'Location', default='')
+            locations = [location] if location else [DEFAULT_LOCATION]
+        method = _payload_value(record, 'InstructionalMethodsDisplay', 'InstructionalMethods', default='')
+        teaching_mode = self.determine_teaching_mode(locations + [str(method)])
+        if not self.section_filter.accepts_placement(locations, teaching_mode):
+            self.metrics.count('filter.skipped_after_locations')
+            return None
+        
+        faculty = _payload_value(record, 'FacultyDisplay', 'Faculty', 'Instructors', default=[]) or []
+        if isinstance(faculty, str):
+            faculty = [faculty]
+        instructors = [f if isinstance(f, str) else _payload_value(f, 'DisplayName', 'Name', default='')
+                       for f in faculty]
+        instructors = [name for name in instructors if name] or [DEFAULT_INSTRUCTOR]
+        
+        title = _payload_value(record, 'Title', 'SectionTitleDisplay', default='')
+        return CourseSection(
+            course_code=key.star,
+            session_code=session_code,
+            course_name=f"{key.dash} {title}".strip(),
+            credits=_payload_number(credits),
+            seats_available=_payload_number(available, 'N/A'),
+            seats_total=_payload_number(capacity, 'N/A'),
+            seats_waitlisted=_payload_number(waitlisted, DEFAULT_WAITLIST),
+            weekdays=weekdays or [DEFAULT_WEEKDAY],
+            class_times=class_times or [DEFAULT_TIME],
+            locations=locations,
+            instructors=instructors,
+            teaching_mode=teaching_mode,
+            start_date=_payload_date(_payload_value(record, 'StartDateDisplay', 'StartDate', default='')),
+            end_date=_payload_date(_payload_value(record, 'EndDateDisplay', 'EndDate', default='')),
+            term=term,
+        )
+
     def extract_basic_course_info(self, soup, course_name):
         """Extract basic course information"""
         course_info = {
@@ -427,12 +661,10 @@ class FranklinCourseScraper:
             'prerequisites': ''
         }
         
-        # Clean course name for matching
-        clean_name = course_name.replace('*', ' ').strip()
-        parts = clean_name.split()
-        if len(parts) >= 2:
-            dept = parts[0].upper()
-            num = parts[1]
+        key = course_key(course_name)
+        course_info['key'] = key
+        if key:
+            dept, num = key.subject, key.number
             patterns = [
                 lambda t: t and f"{dept}-{num}" in t.upper() and 'Credits' in t,
                 lambda t: t and f"{dept} {num}" in t.upper() and 'Credits' in t,
@@ -457,9 +689,15 @@ class FranklinCourseScraper:
         
         return course_info
 
-    def extract_sections_for_term(self, soup, term_header, term_text, course_info, course_name, requested_term=None):
-        """Extract all sections for a specific term using the proven working method"""
+    def extract_sections_for_term(self, soup, term_header, term_text, course_info, course_name, requested_term=None,
+                                  seen: Optional[set] = None):
+        """Extract all sections for a specific term using the proven working method
+
+        Links whose session code fails the filter, or is already in `seen`, are
+        skipped before any detail extraction.
+        """
         sections = []
+        seen = set() if seen is None else seen
         
         # Use requested_term if provided, otherwise fall back to term_text (for backward compatibility)
         term_to_use = requested_term if requested_term else term_text
@@ -504,12 +742,22 @@ class FranklinCourseScraper:
                     )
                     
                     if is_section_link:
+                        session_code = link_text.split()[-1] if link_text else "Unknown"
+                        if not self.section_filter.accepts_code(session_code):
+                            print(f"   ⏭️  Skipping {session_code} (session filter)")
+                            self.metrics.count('filter.skipped_before_extraction')
+                            continue
+                        if session_code in seen:
+                            print(f"   ⏭️  Skipping duplicate {session_code}")
+                            continue
                         print(f"   ✅ Processing section link: {link_text}")
                         section = self.extract_section_details(link, soup, term_to_use, course_info)
                         if section:
+                            seen.add(section.session_code)
                             sections.append(section)
                             print(f"   ✅ Successfully extracted section: {section.session_code}")
-                        else:
+                        elif section is None:
+                            # False means the placement filter skipped it (already logged)
                             print(f"   ❌ Failed to extract section details")
             
             # Also look for section tables directly
@@ -520,14 +768,19 @@ class FranklinCourseScraper:
         print(f"🔍 Total sections found for {term_text}: {len(sections)}")
         return sections
 
-    def extract_section_details(self, link_elem, soup, term, course_info) -> Optional[CourseSection]:
-        """Extract detailed information for a single section using the proven working method"""
+    def extract_section_details(self, link_elem, soup, term, course_info) -> Union[CourseSection, None, bool]:
+        """Extract detailed information for a single section using the proven working method
+
+        Returns False when the section filter rejects its placement, None on failure.
+        """
         try:
             # Get session code from link text
             link_text = link_elem.get_text(strip=True)
             session_code = link_text.split()[-1] if link_text else "Unknown"
             
             print(f"   🔍 Extracting details for section: {session_code}")
+            # The section code carries the course (PF*521-F1FF); the page's course is the fallback
+            key = course_key(session_code) or course_info.get('key')
             
             # Find the section table
             section_table = link_elem.find_next('table', class_='search-sectiontable')
@@ -535,12 +788,19 @@ class FranklinCourseScraper:
                 print(f"   ❌ No section table found for {session_code}")
                 return None
             
+            # Locations decide teaching mode and campus, so the filter can stop here
+            location_info = self.extract_locations(section_table)
+            teaching_mode = self.determine_teaching_mode(location_info)
+            if not self.section_filter.accepts_placement(location_info, teaching_mode):
+                print(f"   ⏭️  Skipping {session_code} ({teaching_mode}, {', '.join(location_info)})")
+                self.metrics.count('filter.skipped_after_locations')
+                return False
+            
             # Extract seat information (enrolled/total/waitlist pattern)
             seats_info = self.extract_seats_info(section_table)
             
-            # Extract time and location information
+            # Extract time information
             time_info = self.extract_time_info(section_table)
-            location_info = self.extract_locations(section_table)
             instructor_info = self.extract_instructor_info(section_table)
             date_info = self.extract_date_info(section_table)
             
@@ -555,7 +815,7 @@ class FranklinCourseScraper:
             
             # Create section object with all the extracted data
             section = CourseSection(
-                course_code=course_info.get('title', 'Unknown').split()[0] + '*' + course_info.get('title', 'Unknown').split()[1] if len(course_info.get('title', '').split()) >= 2 else 'Unknown*Course',
+                course_code=key.star if key else 'Unknown*Course',
                 session_code=session_code,
                 course_name=course_info.get('title', 'Unknown Course'),
                 credits=course_info.get('credits', DEFAULT_CREDITS),
@@ -566,7 +826,7 @@ class FranklinCourseScraper:
                 class_times=time_info.get('times', ['TBD']),
                 locations=location_info,
                 instructors=instructor_info,
-                teaching_mode=self.determine_teaching_mode(location_info),
+                teaching_mode=teaching_mode,
                 start_date=date_info.get('start', '01/15/2025'),
                 end_date=date_info.get('end', '03/15/2025'),
                 term=term
@@ -1070,30 +1330,55 @@ class FranklinCourseScraper:
         else:
             return 'Face-to-Face'
 
+    def fetch_course_page(self, course_code: str, term: str) -> Optional[Tuple[str, str]]:
+        """Load a course's sections page; returns (formatted_code, page_source) or None"""
+        # Canonical DATA*610 form, parsed once from whatever spelling was configured
+        key = course_key(course_code)
+        if key is None:
+            print(f"⚠️  Not a course code: {course_code}, skipping")
+            return None
+        formatted_code = key.star
+        
+        # Always do a fresh search for each course (like the reference code)
+        with self.metrics.timed('search'):
+            found = self.search_course(formatted_code, term)
+        if not found:
+            print(f"❌ Failed to search for {course_code}")
+            return None
+        
+        # Click view sections for this specific course
+        if self.capture:
+            self.capture.reset()
+        with self.metrics.timed('click'):
+            clicked = self.click_view_sections(formatted_code)
+        if not clicked:
+            print(f"❌ Failed to view sections for {course_code}")
+            return None
+        
+        # The sections response the UI rendered from beats its HTML; fall back if none was seen
+        payload = self.capture.latest(SECTIONS_PATH) if self.capture else None
+        if payload is not None:
+            page_source, suffix = json.dumps(payload), ".json"
+        else:
+            page_source, suffix = self.driver.page_source, ".html"
+        self.loaded_courses.append(formatted_code)
+        if self.snapshot_dir:
+            self.save_snapshot(formatted_code, page_source, suffix=suffix)
+        return formatted_code, page_source
+
     def scrape_course(self, course_code: str, term: str) -> List[CourseSection]:
         """Scrape a single course and return its sections"""
         try:
             print(f"🎯 Scraping {course_code}...")
             
-            # Format course code consistently (like the reference code)
-            formatted_code = course_code
-            if '*' not in formatted_code:
-                match = COURSE_FORMAT_PATTERN.match(formatted_code)
-                if match:
-                    formatted_code = f"{match.group(1)}*{match.group(2)}"
-            
-            # Always do a fresh search for each course (like the reference code)
-            if not self.search_course(formatted_code, term):
-                print(f"❌ Failed to search for {course_code}")
-                return []
-            
-            # Click view sections for this specific course
-            if not self.click_view_sections(formatted_code):
-                print(f"❌ Failed to view sections for {course_code}")
+            page = self.fetch_course_page(course_code, term)
+            if page is None:
                 return []
+            formatted_code, page_source = page
             
             # Extract course information
-            sections = self.extract_course_info(formatted_code, term)
+            with self.metrics.timed('extract'):
+                sections = self.extract_sections(formatted_code, term, page_source)
             
             if sections:
                 print(f"✅ Found {len(sections)} sections for {course_code}")
@@ -1116,6 +1401,8 @@ class FranklinCourseScraper:
             for i, (course_code, is_first_term) in enumerate(course_request.courses, 1):
                 print(f"\n📚 Course {i}/{len(course_request.courses)}: {course_code}")
                 
+                # Shared rate limit keeps a respectful pause between courses
+                self.rate_limiter.wait()
                 sections = self.scrape_course(course_code, course_request.term)
                 
                 # Mark first-term courses
@@ -1123,10 +1410,6 @@ class FranklinCourseScraper:
                     section.is_first_term = is_first_term
                 
                 all_sections.extend(sections)
-                
-                # Brief pause between courses to be respectful
-                if i < len(course_request.courses):
-                    time.sleep(INTER_COURSE_DELAY)
             
             print(f"\n✅ Scraping complete: {len(all_sections)} total sections found")
             return all_sections
@@ -1135,14 +1418,357 @@ class FranklinCourseScraper:
             print(f"❌ Multi-course scraping failed: {e}")
             return all_sections
 
-def main():
+    def scrape_direct(self, course_request: CourseRequest,
+                      client: Optional[SelfServiceClient] = None) -> List[CourseSection]:
+        """
+        Retrieve each course's sections straight from the Self-Service JSON endpoint
+
+        No browser and no rendered DOM: one lightweight request per course
+        (two if the course id isn't known from discovery yet). Payloads are
+        archived as .json snapshots so `parse` can replay them.
+        """
+        client = client or SelfServiceClient()
+        term_code = client.term_code(course_request.term) if course_request.term else None
+        all_sections = []
+        print(f"🎯 Direct retrieval of {len(course_request.courses)} courses...")
+        for i, (course_code, is_first_term) in enumerate(course_request.courses, 1):
+            key = course_key(course_code)
+            if key is None:
+                print(f"⚠️  Not a course code: {course_code}")
+                continue
+            self.rate_limiter.wait()
+            try:
+                with self.metrics.timed('sections_request'):
+                    payload = retry(lambda: client.course_sections(key.star, term_code),
+                                    attempts=PAGE_LOAD_ATTEMPTS, metrics=self.metrics,
+                                    on_error=lambda n, e: print(f"⚠️  Request attempt {n} failed: {e}"))
+            except Exception as e:
+                print(f"❌ Error retrieving {course_code}: {e}")
+                continue
+            if payload is None:
+                # A completed search without the course: none of its sections remain
+                print(f"⚠️  {course_code}: not offered")
+                self.loaded_courses.append(key.star)
+                continue
+            if self.snapshot_dir:
+                self.save_snapshot(key.star, json.dumps(payload), suffix=".json")
+            with self.metrics.timed('extract'):
+                sections = self.sections_from_payload(payload, key.star, course_request.term)
+            if sections is None:
+                continue
+            self.loaded_courses.append(key.star)
+            for section in sections:
+                section.is_first_term = is_first_term
+            print(f"📚 {i}/{len(course_request.courses)} {key}: {len(sections)} sections")
+            all_sections.extend(sections)
+        print(f"\n✅ Direct retrieval complete: {len(all_sections)} total sections found")
+        return all_sections
+
+    def scrape_pipelined(self, course_request: CourseRequest, sink: 'SectionSink',
+                         parse_workers: int = PIPELINE_PARSE_WORKERS,
+                         queue_size: int = PIPELINE_QUEUE_SIZE) -> int:
+        """Fetch pages in this thread while a process pool parses them; returns sections written
+
+        The browser never waits on BeautifulSoup and vice versa: fetched pages go
+        through a bounded queue to a consumer thread that feeds the parse pool and
+        streams results to `sink` in course order. When parsing falls behind, the
+        queue fills and fetching blocks, so memory stays bounded.
+        """
+        pages = queue.Queue(maxsize=queue_size)
+        written = [0]
+        errors = []
+
+        finished = threading.Event()
+
+        def consume():
+            try:
+                # Created off the main thread while it drives Chrome, so never fork here
+                with ProcessPoolExecutor(max_workers=max(1, parse_workers), initializer=_init_worker,
+                                         initargs=(self.section_filter,),
+                                         mp_context=multiprocessing.get_context(POOL_START_METHOD)) as pool:
+                    pending = deque()
+                    while True:
+                        job = pages.get()
+                        if job is None:
+                            finished.set()
+                            break
+                        pending.append(pool.submit(_extract_source, job))
+                        # Emit finished work in order; cap in-flight parses at the queue size
+                        while pending and (pending[0].done() or len(pending) >= queue_size):
+                            written[0] += sink.write(pending.popleft().result())
+                    while pending:
+                        written[0] += sink.write(pending.popleft().result())
+            except Exception as e:
+                errors.append(e)
+                # Keep draining so the fetcher never blocks on a dead consumer
+                while not finished.is_set() and pages.get() is not None:
+                    pass
+
+        consumer = threading.Thread(target=consume, name="parse-consumer", daemon=True)
+        consumer.start()
+        print(f"🎯 Pipelined scrape of {len(course_request.courses)} courses "
+              f"({parse_workers} parse workers, queue of {queue_size})...")
+        try:
+            for i, (course_code, is_first_term) in enumerate(course_request.courses, 1):
+                print(f"\n📚 Course {i}/{len(course_request.courses)}: {course_code}")
+                self.rate_limiter.wait()
+                try:
+                    with self.metrics.timed('fetch'):
+                        page = self.fetch_course_page(course_code, course_request.term)
+                except Exception as e:
+                    print(f"❌ Error fetching {course_code}: {e}")
+                    continue
+                if page is not None:
+                    with self.metrics.timed('queue_wait'):
+                        pages.put((page[0], course_request.term, page[1], is_first_term))
+        finally:
+            pages.put(None)
+            consumer.join()
+        if errors:
+            raise errors[0]
+        print(f"\n✅ Pipelined scraping complete: {written[0]} sections written")
+        return written[0]
+
+
+def _payload_value(record, *names, default=None):
+    """First present, non-empty field among `names` (Self-Service field names vary by version)"""
+    if not isinstance(record, dict):
+        return default
+    for name in names:
+        value = record.get(name)
+        if value not in (None, '', []):
+            return value
+    return default
+
+
+def _payload_number(value, default: str = '0') -> str:
+    """12 / 12.0 / '12' -> '12'; missing -> default"""
+    if value in (None, ''):
+        return default
+    try:
+        return str(int(float(value)))
+    except (TypeError, ValueError):
+        return str(value)
+
+
+PAYLOAD_DAYS = {
+    'm': 'Monday', 'mon': 'Monday', 'monday': 'Monday',
+    't': 'Tuesday', 'tu': 'Tuesday', 'tue': 'Tuesday', 'tues': 'Tuesday', 'tuesday': 'Tuesday',
+    'w': 'Wednesday', 'wed': 'Wednesday', 'wednesday': 'Wednesday',
+    'r': 'Thursday', 'th': 'Thursday', 'thu': 'Thursday', 'thur': 'Thursday', 'thurs': 'Thursday',
+    'thursday': 'Thursday',
+    'f': 'Friday', 'fri': 'Friday', 'friday': 'Friday',
+    's': 'Saturday', 'sa': 'Saturday', 'sat': 'Saturday', 'saturday': 'Saturday',
+    'u': 'Sunday', 'su': 'Sunday', 'sun': 'Sunday', 'sunday': 'Sunday',
+}
+
+
+def _payload_days(value) -> List[str]:
+    """'M/W', 'Tu Th', ['Tuesday', 'Thursday'], [2, 4] (0 = Sunday) -> full weekday names"""
+    if isinstance(value, list):
+        names = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
+        return [names[v] if isinstance(v, int) and 0 <= v < 7 else PAYLOAD_DAYS.get(str(v).lower(), str(v))
+                for v in value]
+    tokens = [t for t in re.split(r'[\s,/;]+', str(value)) if t]
+    return [PAYLOAD_DAYS[t.lower()] for t in tokens if t.lower() in PAYLOAD_DAYS]
+
+
+def _payload_date(value) -> str:
+    """'2026-01-12T00:00:00' / '1/12/2026' -> '1/12/2026' (HTML extraction's format)"""
+    match = re.match(r'(\d{4})-(\d{2})-(\d{2})', str(value))
+    if match:
+        year, month, day = match.groups()
+        return f"{int(month)}/{int(day)}/{year}"
+    return str(value) if value else 'N/A'
+
+
+class SectionSink:
+    """Streams CourseSection rows to the CSV as they are parsed
+
+    Rows go to a .partial file that replaces the target only on a successful
+    close with at least one row, so an aborted run leaves the old CSV intact.
+    """
+
+    def __init__(self, filename=None, scraped_datetime: str = None, events: Optional[EventStream] = None):
+        self.path = Path(filename) if filename else DEFAULT_CSV
+        self.events = events
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.partial = self.path.with_name(self.path.name + '.partial')
+        self.scraped_datetime = scraped_datetime or datetime.now(EST).isoformat()
+        self.count = 0
+        self._file = open(self.partial, 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(CSV_HEADERS)
+
+    def write(self, sections: List[CourseSection]) -> int:
+        self._writer.writerows(FranklinCourseScraper.section_row(s, self.scraped_datetime) for s in sections)
+        self._file.flush()
+        if self.events:
+            self.events.observe(sections, self.scraped_datetime)
+        self.count += len(sections)
+        return len(sections)
+
+    def close(self, commit: bool = True):
+        self._file.close()
+        if commit and self.count:
+            os.replace(self.partial, self.path)
+            print(f"✅ Saved {self.count} sections to {self.path}")
+        else:
+            os.remove(self.partial)
+
+def snapshot_dirs(since: Optional[str] = None) -> List[Path]:
+    """Archived fetch folders (data/pages/<YYYYMMDD>) with a manifest, oldest first"""
+    if not PAGES_DIR.is_dir():
+        return []
+    return sorted(d for d in PAGES_DIR.iterdir()
+                  if (d / SNAPSHOT_MANIFEST).exists() and (since is None or d.name >= since))
+
+
+def latest_snapshot_dir() -> Optional[Path]:
+    """Most recent data/pages/<YYYYMMDD> folder with a manifest"""
+    dated = snapshot_dirs()
+    return dated[-1] if dated else None
+
+
+def snapshot_jobs(snapshot_dir) -> Tuple[List[tuple], Optional[str]]:
+    """[(course_code, term, page_path, first_term)] for one archived fetch, plus its fetch time"""
+    snapshot_dir = Path(snapshot_dir)
+    with open(snapshot_dir / SNAPSHOT_MANIFEST, encoding='utf-8') as f:
+        manifest = json.load(f)
+    term = manifest.get('term', '')
+    jobs = [(entry['course_code'], term, str(snapshot_dir / entry['file']), entry.get('first_term', False))
+            for entry in manifest['courses']]
+    return jobs, manifest.get('fetched_at')
+
+
+_worker_scraper = None
+
+
+def _init_worker(section_filter: Optional[SectionFilter] = None):
+    """Process-pool initializer: give this process a driverless scraper with the run's filter"""
+    global _worker_scraper
+    _worker_scraper = FranklinCourseScraper(start_driver=False, section_filter=section_filter)
+
+
+def _extract_page(job) -> List[CourseSection]:
+    """Process-pool task: re-extract one archived page file"""
+    course_code, term, page_path, first_term = job
+    return _extract_source((course_code, term, Path(page_path).read_text(encoding='utf-8'), first_term))
+
+
+def _extract_source(job) -> List[CourseSection]:
+    """Process-pool task: extract one page source with a per-process, driverless scraper"""
+    if _worker_scraper is None:
+        _init_worker()
+    course_code, term, page_source, first_term = job
+    # Per-section progress lines from every worker would interleave into noise
+    with contextlib.redirect_stdout(open(os.devnull, 'w')) as quiet:
+        try:
+            sections = _worker_scraper.extract_sections(course_code, term, page_source)
+        finally:
+            quiet.close()
+    for section in sections:
+        section.is_first_term = first_term
+    return sections
+
+
+def reextract_snapshots(dirs: List[Path], workers: Optional[int] = None,
+                        chunksize: Optional[int] = None, section_filter: Optional[SectionFilter] = None
+                        ) -> List[Tuple[Optional[str], List[CourseSection]]]:
+    """Re-extract archived fetches over a process pool; returns [(fetched_at, sections)] per folder
+
+    Pages from all folders are flattened into one job list and handed out in
+    chunks; map() keeps results in submission order, so output is deterministic.
+    """
+    section_filter = section_filter or SectionFilter()
+    jobs, spans = [], []
+    for snapshot_dir in dirs:
+        dir_jobs, fetched_at = snapshot_jobs(snapshot_dir)
+        # Courses the filter rejects outright are never read
+        dir_jobs = [job for job in dir_jobs if section_filter.accepts_course(job[3])]
+        spans.append((fetched_at, len(jobs), len(jobs) + len(dir_jobs)))
+        jobs.extend(dir_jobs)
+    if not jobs:
+        return []
+
+    workers = min(workers or os.cpu_count() or 1, max(1, len(jobs) // MIN_PAGES_PER_WORKER))
+    chunksize = chunksize or max(1, len(jobs) // (workers * CHUNKS_PER_WORKER))
+    print(f"⚙️  Re-extracting {len(jobs)} pages from {len(dirs)} fetches "
+          f"({workers} processes, chunks of {chunksize})")
+    if workers == 1:
+        _init_worker(section_filter)
+        results = [_extract_page(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(section_filter,),
+                                 mp_context=multiprocessing.get_context(POOL_START_METHOD)) as pool:
+            results = list(pool.map(_extract_page, jobs, chunksize=chunksize))
+
+    batches = [(fetched_at, [section for page in results[start:end] for section in page])
+               for fetched_at, start, end in spans]
+    print(f"✅ Re-extracted {sum(len(sections) for _, sections in batches)} sections")
+    return batches
+
+
+def save_history_csv(batches: List[Tuple[Optional[str], List[CourseSection]]], filename=HISTORY_CSV):
+    """All re-extracted fetches in one CSV, each row stamped with its own fetch time"""
+    with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(CSV_HEADERS)
+        for fetched_at, sections in batches:
+            writer.writerows(FranklinCourseScraper.section_row(section, fetched_at or '') for section in sections)
+    print(f"✅ Saved {sum(len(sections) for _, sections in batches)} sections to {filename}")
+
+def add_filter_arguments(parser):
+    parser.add_argument('--sessions', nargs='*', default=DEFAULT_SESSION_PATTERNS, metavar='PATTERN',
+                        help="keep sections whose code matches any of these regexes "
+                             "(default: FF, face-to-face; pass no patterns to keep all)")
+    parser.add_argument('--modes', nargs='*', default=[], metavar='MODE',
+                        help="keep only these teaching modes, e.g. Face-to-Face Hybrid")
+    parser.add_argument('--campuses', nargs='*', default=[], metavar='TEXT',
+                        help="keep only sections whose location contains one of these")
+    parser.add_argument('--first-term-only', action='store_true', help="only first-term courses")
+
+
+def section_filter_from(args) -> SectionFilter:
+    return SectionFilter(session_patterns=args.sessions, modes=args.modes,
+                         campuses=args.campuses, first_term_only=args.first_term_only)
+
+
+def event_stream_for(args, section_filter: SectionFilter) -> Optional[EventStream]:
+    """The change event stream for this run, or None when events are off
+
+    The stream's stored state follows default-filter runs. A narrower filter would
+    read as removals, and a wider one as additions the next default run removes
+    again, so filtered runs record no events.
+    """
+    if args.no_events:
+        return None
+    if section_filter != SectionFilter():
+        print("ℹ️  Non-default section filter: change events are not recorded for this run")
+        return None
+    return EventStream(EVENTS_LOG)
+
+
+def cmd_fetch(args):
     scraper = None
     try:
         print("🎯 Franklin University Course Scraper - Data Collection")
         print("=" * 60)
         
-        scraper = FranklinCourseScraper(headless=True)
-        course_request = scraper.read_course_list("course_request.md")
+        snapshot_dir = None if args.no_archive else PAGES_DIR / datetime.now(EST).strftime('%Y%m%d')
+        # Direct retrieval needs no browser at all
+        section_filter = section_filter_from(args)
+        scraper = FranklinCourseScraper(headless=True, start_driver=not args.direct, snapshot_dir=snapshot_dir,
+                                        capture=args.capture, section_filter=section_filter,
+                                        fast_load=args.fast_load)
+        client = SelfServiceClient()
+        if args.discover:
+            course_request = scraper.discover_course_list(args.term, args.subjects, args.workers, client=client)
+        else:
+            course_request = scraper.read_course_list("course_request.md")
+        # Courses the filter rejects outright are never fetched
+        course_request.courses = [(code, first) for code, first in course_request.courses
+                                  if section_filter.accepts_course(first)]
         
         if not course_request.courses:
             print("❌ No courses to process")
@@ -1150,10 +1776,34 @@ def main():
         
         # Actually scrape the courses
         print("🌐 Starting web scraping...")
-        sections = scraper.scrape_multiple_courses(course_request)
+        events = event_stream_for(args, section_filter)
+        scraped_datetime = datetime.now(EST).isoformat()
+        if args.pipeline:
+            sink = SectionSink(args.output, scraped_datetime, events=events)
+            try:
+                scraper.scrape_pipelined(course_request, sink, args.parse_workers)
+            except BaseException:
+                sink.close(commit=False)
+                raise
+            sink.close()
+            scraper.write_snapshot_manifest(course_request)
+            if not sink.count:
+                print("❌ No data collected")
+            elif events:
+                events.finish(scraper.loaded_courses, scraped_datetime)
+                print(f"📣 {events.count} change events -> {EVENTS_LOG}")
+            return
+        if args.direct:
+            sections = scraper.scrape_direct(course_request, client)
+        else:
+            sections = scraper.scrape_multiple_courses(course_request)
+        scraper.write_snapshot_manifest(course_request)
         
         if sections:
-            scraper.save_to_csv(sections)
+            scraper.save_to_csv(sections, args.output, scraped_datetime)
+            if events:
+                events.emit(sections, scraper.loaded_courses, scraped_datetime)
+                print(f"📣 {events.count} change events -> {EVENTS_LOG}")
             print("✅ Data collection complete")
         else:
             print("❌ No data collected")
@@ -1165,5 +1815,199 @@ def main():
             scraper.close()
 
 
+def cmd_parse(args):
+    if args.all or args.since:
+        # Rebuild the whole archive into one history CSV
+        dirs = snapshot_dirs(args.since)
+        if not dirs:
+            print(f"❌ No archived pages found in {PAGES_DIR}")
+            return 1
+        batches = reextract_snapshots(dirs, args.workers, args.chunksize, section_filter_from(args))
+        save_history_csv(batches, args.output or HISTORY_CSV)
+        return 0
+
+    snapshot_dir = Path(args.pages) if args.pages else latest_snapshot_dir()
+    if snapshot_dir is None or not (snapshot_dir / SNAPSHOT_MANIFEST).exists():
+        print(f"❌ No archived pages found (looked in {args.pages or PAGES_DIR})")
+        return 1
+    print(f"📂 Re-extracting from {snapshot_dir}")
+    batches = reextract_snapshots([snapshot_dir], args.workers, args.chunksize, section_filter_from(args))
+    fetched_at, sections = batches[0] if batches else (None, [])
+    if not sections:
+        print("❌ No data extracted")
+        return 1
+    FranklinCourseScraper(start_driver=False).save_to_csv(sections, args.output, scraped_datetime=fetched_at)
+    return 0
+
+
+def cmd_export(args):
+    source = Path(args.input)
+    output = Path(args.output) if args.output else source.with_suffix('.' + args.format)
+    if args.format == 'json':
+        with open(source, newline='', encoding='utf-8') as f:
+            records = list(csv.DictReader(f))
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(records, f, indent=1)
+    else:
+        import pandas as pd
+        pd.read_csv(source, dtype=str, keep_default_na=False).to_excel(output, index=False)
+    print(f"✅ Exported {source.name} to {output}")
+    return 0
+
+
+def cmd_stats(args):
+    from build_course_analytics import DEFAULT_OUTPUT, build_analytics
+
+    # Only the default CSV owns the cached artifact; other inputs are summarized in memory
+    default_input = Path(args.input).resolve() == DEFAULT_CSV.resolve()
+    artifact = build_analytics(args.input, DEFAULT_OUTPUT if default_input else None)
+    if not artifact:
+        return 1
+    overall = artifact['overall']
+    print(f"📊 {artifact['source']} (scraped {artifact.get('scraped_datetime') or 'unknown'})")
+    print(f"   {overall['courses']} courses, {overall['sections']} sections")
+    print(f"   {overall['enrolled']}/{overall['capacity']} seats filled ({overall['fill_rate']:.1%}), "
+          f"{overall['waitlist']} waitlisted")
+    for mode, totals in sorted(artifact['modes'].items()):
+        print(f"   {mode}: {totals['sections']} sections, {totals['fill_rate']:.1%} full")
+    forecast = artifact.get('forecast')
+    if forecast:
+        print(f"   Forecast for {forecast['term']} (as of {forecast['as_of']}): {forecast['full']} full, "
+              f"{forecast['filling']} more projected to fill before they start")
+    return 0
+
+
+def cmd_watch(args):
+    section_filter = section_filter_from(args)
+    scraper = FranklinCourseScraper(start_driver=False, section_filter=section_filter)
+    course_request = scraper.read_course_list("course_request.md")
+    codes = args.courses or [code for code, first in course_request.courses
+                             if section_filter.accepts_course(first)]
+    keys = [course_key(code) for code in codes]
+    if not keys or None in keys:
+        print("❌ No valid courses to watch")
+        return 1
+    client = SelfServiceClient()
+    term = args.term or course_request.term
+    term_code = client.term_code(term) if term else None
+
+    events = event_stream_for(args, section_filter)
+
+    def fetch(code):
+        # Per-section extraction chatter would bury the change notices
+        with contextlib.redirect_stdout(open(os.devnull, 'w')) as quiet:
+            try:
+                # Re-search now and then so sections added mid-registration get polled too
+                payload = client.course_sections(code, term_code, max_age=SECTION_IDS_MAX_AGE)
+                sections = scraper.sections_from_payload(payload, code, term) if payload is not None else None
+            finally:
+                quiet.close()
+        # Counted as a failed poll by the watcher; emitting here would read as every section removed
+        if payload is None:
+            raise ValueError("no section listing returned")
+        if sections is None:
+            raise ValueError("section payload could not be parsed")
+        if events:
+            events.emit(sections, [code])
+        return sections
+
+    watcher = SeatWatcher([key.star for key in keys], fetch, args.output or WATCH_LOG,
+                          budget=args.budget, min_interval=args.min_interval,
+                          max_interval=args.max_interval, metrics=scraper.metrics)
+    watcher.run(args.duration * 60 if args.duration else None)
+    scraper.metrics.report()
+    return 0
+
+
+def cmd_events(args):
+    def show(event):
+        change = f"{event.get('o')} -> {event.get('n')}" if 'o' in event and 'n' in event else ''
+        print(f"{event['t']}  {event['e']:<10} {event['k']:<16} {change}", flush=True)
+
+    if not args.follow and not Path(args.input).exists():
+        print(f"❌ No event stream at {args.input}")
+        return 1
+    subscribe(args.input, show, args.types, follow=args.follow)
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Franklin University course scraper")
+    commands = parser.add_subparsers(dest='command')
+
+    fetch = commands.add_parser('fetch', help="scrape live pages (default)")
+    fetch.add_argument('--discover', action='store_true',
+                       help="scrape every course offered in the term, found via catalog search")
+    fetch.add_argument('--term', default=None, help="term to discover, e.g. 'Spring 2026' "
+                       "(default: the Term: line in course_request.md)")
+    fetch.add_argument('--subjects', nargs='*', default=None,
+                       help="limit discovery to these subject codes, e.g. DATA MATH")
+    fetch.add_argument('--workers', type=int, default=DISCOVERY_WORKERS,
+                       help="concurrent catalog search requests during discovery")
+    fetch.add_argument('--no-archive', action='store_true', help="don't save page snapshots")
+    fetch.add_argument('--direct', action='store_true',
+                       help="request section listings from Self-Service's JSON endpoint (no browser)")
+    fetch.add_argument('--capture', action='store_true',
+                       help="build sections from the section responses the browser receives, not its HTML")
+    fetch.add_argument('--fast-load', action='store_true',
+                       help="eager page loads with images, fonts and analytics requests blocked")
+    fetch.add_argument('--pipeline', action='store_true',
+                       help="parse pages in a process pool while the browser fetches the next ones")
+    fetch.add_argument('--parse-workers', type=int, default=PIPELINE_PARSE_WORKERS)
+    fetch.add_argument('--output', default=None, help="CSV path (default: data/franklin_courses.csv)")
+    add_filter_arguments(fetch)
+    fetch.add_argument('--no-events', action='store_true',
+                       help="don't append change events to data/section_events.jsonl")
+
+    parse = commands.add_parser('parse', help="re-extract the CSV from archived pages")
+    parse.add_argument('--pages', default=None, help="snapshot folder (default: latest in data/pages)")
+    parse.add_argument('--all', action='store_true',
+                       help="re-extract every archived fetch into data/franklin_courses_history.csv")
+    parse.add_argument('--since', default=None, help="like --all, from this YYYYMMDD folder on")
+    parse.add_argument('--workers', type=int, default=None, help="processes (default: all cores)")
+    parse.add_argument('--chunksize', type=int, default=None, help="pages per work unit")
+    add_filter_arguments(parse)
+    parse.add_argument('--output', default=None, help="CSV path (default: data/franklin_courses.csv, "
+                       "or the history CSV with --all/--since)")
+
+    export = commands.add_parser('export', help="convert the CSV to JSON or Excel")
+    export.add_argument('--format', choices=['json', 'xlsx'], default='json')
+    export.add_argument('--input', default=str(DEFAULT_CSV))
+    export.add_argument('--output', default=None)
+
+    stats = commands.add_parser('stats', help="summarize the CSV")
+    stats.add_argument('--input', default=str(DEFAULT_CSV))
+
+    watch = commands.add_parser('watch', help="poll seats adaptively and log every change")
+    watch.add_argument('--courses', nargs='*', default=None,
+                       help="course codes to watch, e.g. DATA*610 (default: course_request.md)")
+    watch.add_argument('--term', default=None, help="default: the Term: line in course_request.md")
+    watch.add_argument('--budget', type=int, default=REQUEST_BUDGET, help="polls per hour, all courses")
+    watch.add_argument('--min-interval', type=float, default=MIN_INTERVAL,
+                       help="seconds between polls of a nearly full or moving course")
+    watch.add_argument('--max-interval', type=float, default=MAX_INTERVAL,
+                       help="seconds between polls of a stable course")
+    watch.add_argument('--duration', type=float, default=None, help="minutes to run (default: until Ctrl-C)")
+    watch.add_argument('--output', default=None, help="JSONL path (default: data/seat_watch.jsonl)")
+    watch.add_argument('--no-events', action='store_true',
+                       help="don't append change events to data/section_events.jsonl")
+    add_filter_arguments(watch)
+
+    events = commands.add_parser('events', help="print (or follow) the change event stream")
+    events.add_argument('--follow', '-f', action='store_true', help="keep waiting for new events")
+    events.add_argument('--types', nargs='*', choices=EVENT_TYPES, default=None)
+    events.add_argument('--input', default=str(EVENTS_LOG))
+
+    argv = sys.argv[1:] if argv is None else argv
+    # Bare invocations (and fetch flags without a subcommand) keep scraping as before
+    if not argv or argv[0] not in commands.choices and argv[0] not in ('-h', '--help'):
+        argv = ['fetch'] + list(argv)
+    args = parser.parse_args(argv)
+
+    handlers = {'fetch': cmd_fetch, 'parse': cmd_parse, 'export': cmd_export, 'stats': cmd_stats,
+                'watch': cmd_watch, 'events': cmd_events}
+    return handlers[args.command](args)
+
+
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Adaptive Seat Watch
+
+Polls courses repeatedly during registration and records every observed
+seat, capacity and waitlist change with a timestamp. Each course has its own
+polling interval: it drops to the minimum when a section is nearly full or
+its waitlist moved, and backs off geometrically while nothing changes. All
+polls share one request budget (requests per hour), so watching more
+courses spreads polls out instead of sending more traffic.
+
+Author: Course Analytics Project
+Version: 1.0
+"""
+
+import heapq
+import json
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from scraping_runtime import RateLimiter, RunMetrics
+
+MIN_INTERVAL = 120          # seconds between polls of a hot course
+MAX_INTERVAL = 3600         # seconds between polls of a stable course
+BACKOFF = 2.0               # interval multiplier after a quiet poll
+LOW_SEATS = 3               # a section this close to full keeps its course hot
+REQUEST_BUDGET = 120        # polls per hour across all watched courses
+
+WATCHED_FIELDS = ('seats_available', 'seats_total', 'seats_waitlisted')
+
+# session_code -> (seats_available, seats_total, seats_waitlisted)
+SeatState = Dict[str, Tuple[str, str, str]]
+
+
+@dataclass
+class CourseWatch:
+    """Polling state for one course"""
+    course_code: str
+    interval: float = MIN_INTERVAL
+    seats: Optional[SeatState] = None
+    polls: int = 0
+    changes: int = 0
+
+
+@dataclass(order=True)
+class _Due:
+    at: float
+    course_code: str = field(compare=False)
+
+
+def _as_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def seat_state(sections) -> SeatState:
+    """Seat-related fields of each section, keyed by session code"""
+    return {s.session_code: tuple(str(getattr(s, f)) for f in WATCHED_FIELDS) for s in sections}
+
+
+def seat_changes(old: SeatState, new: SeatState) -> List[dict]:
+    """Field-level differences between two polls of the same course"""
+    changes = []
+    for session in sorted(set(old) | set(new)):
+        before, after = old.get(session), new.get(session)
+        if before == after:
+            continue
+        if before is None or after is None:
+            changes.append({'session': session, 'field': 'section',
+                            'old': 'present' if before else None, 'new': 'present' if after else None})
+            continue
+        for name, was, now in zip(WATCHED_FIELDS, before, after):
+            if was != now:
+                changes.append({'session': session, 'field': name, 'old': was, 'new': now})
+    return changes
+
+
+def is_hot(seats: SeatState, changes: List[dict], low_seats: int = LOW_SEATS) -> bool:
+    """Nearly full somewhere, or a waitlist moved since the last poll"""
+    if any(change['field'] == 'seats_waitlisted' for change in changes):
+        return True
+    for available, _total, _waitlisted in seats.values():
+        count = _as_int(available)
+        if count is not None and count <= low_seats:
+            return True
+    return False
+
+
+class SeatWatcher:
+    """
+    Adaptive scheduler over a set of courses.
+
+    Args:
+        courses (List[str]): Course codes to watch
+        fetch (Callable): course_code -> list of CourseSection (one request)
+        log_path (Path): JSONL file that observed changes are appended to
+        budget (int): Maximum polls per hour across all courses
+    """
+
+    def __init__(self, courses: List[str], fetch: Callable, log_path,
+                 budget: int = REQUEST_BUDGET, min_interval: float = MIN_INTERVAL,
+                 max_interval: float = MAX_INTERVAL, low_seats: int = LOW_SEATS,
+                 metrics: Optional[RunMetrics] = None):
+        self.fetch = fetch
+        self.log_path = Path(log_path)
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.low_seats = low_seats
+        self.metrics = metrics or RunMetrics()
+        self.budget = RateLimiter(3600.0 / max(1, budget))
+        self.watches = {code: CourseWatch(code, interval=min_interval) for code in courses}
+        now = time.monotonic()
+        self._queue = [_Due(now, code) for code in self.watches]
+        heapq.heapify(self._queue)
+
+    def _record(self, course_code: str, changes: List[dict]):
+        if not changes:
+            return
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().astimezone().isoformat(timespec='seconds')
+        with open(self.log_path, 'a', encoding='utf-8') as f:
+            for change in changes:
+                f.write(json.dumps(dict(ts=timestamp, course=course_code, **change)) + '\n')
+
+    def poll(self, course_code: str) -> List[dict]:
+        """Poll one course now, record changes and reschedule it"""
+        watch = self.watches[course_code]
+        self.budget.wait()
+        try:
+            with self.metrics.timed('watch_poll'):
+                sections = self.fetch(course_code)
+        except Exception as e:
+            # Keep the interval: a hot course must not drop to the slow schedule on one error
+            print(f"⚠️  {course_code}: poll failed ({e}); retrying in {watch.interval:.0f}s")
+            self.metrics.count('watch.errors')
+            return []
+        seats = seat_state(sections)
+        changes = seat_changes(watch.seats, seats) if watch.seats is not None else []
+        self._record(course_code, changes)
+
+        hot = is_hot(seats, changes, self.low_seats)
+        if hot:
+            watch.interval = self.min_interval
+        elif changes:
+            watch.interval = max(self.min_interval, watch.interval / BACKOFF)
+        else:
+            watch.interval = min(self.max_interval, watch.interval * BACKOFF)
+        watch.seats = seats
+        watch.polls += 1
+        watch.changes += len(changes)
+        self.metrics.count('watch.polls')
+        self.metrics.count('watch.changes', len(changes))
+        if changes:
+            print(f"🔔 {course_code}: {len(changes)} change(s); next poll in {watch.interval:.0f}s")
+        return changes
+
+    def run(self, duration: Optional[float] = None):
+        """Poll due courses until `duration` seconds have passed (forever if None)"""
+        deadline = time.monotonic() + duration if duration else None
+        print(f"👀 Watching {len(self.watches)} courses "
+              f"({3600.0 / self.budget.interval:.0f} polls/hour budget)")
+        try:
+            while self._queue:
+                due = heapq.heappop(self._queue)
+                now = time.monotonic()
+                if deadline and due.at >= deadline:
+                    break
+                if due.at > now:
+                    time.sleep(due.at - now)
+                self.poll(due.course_code)
+                heapq.heappush(self._queue, _Due(time.monotonic() + self.watches[due.course_code].interval,
+                                                 due.course_code))
+        except KeyboardInterrupt:
+            print("\n⏹️  Watch stopped")
+        total = sum(w.changes for w in self.watches.values())
+        print(f"✅ {sum(w.polls for w in self.watches.values())} polls, {total} changes -> {self.log_path}")
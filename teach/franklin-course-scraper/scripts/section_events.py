@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Section Change Event Stream
+
+Turns scraped sections into an append-only JSONL stream of changes against
+the last known state of each section, so consumers react to a few bytes per
+change instead of diffing whole CSVs. Every line is one compact event:
+
+    {"t": "2026-01-05T09:12:00-05:00", "e": "seats", "k": "DATA*610-F1FF", "o": [3, 25], "n": [2, 25]}
+
+    t  observation time      e  event type        k  session code
+    o  old value             n  new value (absent for removals)
+
+Event types: add, remove, seats ([available, total]), waitlist,
+instructor, room, time. The last known state lives next to the stream, so
+events are computed incrementally across runs; tail() lets a local process
+follow the stream as it grows.
+
+Author: Course Analytics Project
+Version: 1.0
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from course_key import course_key
+
+EVENT_TYPES = ('add', 'remove', 'seats', 'waitlist', 'instructor', 'room', 'time')
+STATE_SUFFIX = '.state.json'
+TAIL_POLL_INTERVAL = 1.0  # seconds between checks for new lines when following
+
+
+def _count(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None if value in (None, '', 'N/A') else str(value)
+
+
+def section_state(section) -> Dict[str, object]:
+    """The tracked value of each event type for one CourseSection"""
+    return {
+        'seats': [_count(section.seats_available), _count(section.seats_total)],
+        'waitlist': _count(section.seats_waitlisted),
+        'instructor': ', '.join(section.instructors),
+        'room': ', '.join(section.locations),
+        'time': ', '.join(f"{day} {times}" for day, times in zip(section.weekdays, section.class_times)),
+    }
+
+
+def _course(code: str) -> str:
+    key = course_key(code)
+    return key.star if key else code
+
+
+class EventStream:
+    """
+    Appends change events to `path` and keeps the last known state beside it.
+
+    observe() compares a batch of sections with the stored state and queues
+    add/field events; finish() adds removals for sections of the given
+    courses that were not observed since the last finish() for them, then
+    writes the queued events and saves the state together. A run that stops
+    before finish() writes nothing, so the next run reports the same changes
+    once instead of twice.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.state_path = self.path.with_name(self.path.name + STATE_SUFFIX)
+        self.state: Dict[str, dict] = self._load()
+        self.seen: Set[str] = set()
+        self.pending: List[dict] = []
+        self.count = 0
+
+    def _load(self) -> Dict[str, dict]:
+        if self.state_path.exists():
+            with open(self.state_path, encoding='utf-8') as f:
+                return json.load(f)
+        return {}
+
+    def _save(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, separators=(',', ':'))
+        os.replace(tmp_path, self.state_path)
+
+    def _append(self, events: List[dict]):
+        if not events:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.writelines(json.dumps(event, separators=(',', ':')) + '\n' for event in events)
+        self.count += len(events)
+
+    @staticmethod
+    def _timestamp(timestamp: Optional[str]) -> str:
+        return timestamp or datetime.now().astimezone().isoformat(timespec='seconds')
+
+    def observe(self, sections: Iterable, timestamp: Optional[str] = None) -> List[dict]:
+        """Queue add and field-change events for a batch of scraped sections (written by finish())"""
+        t = self._timestamp(timestamp)
+        events = []
+        for section in sections:
+            key = section.session_code
+            current = section_state(section)
+            previous = self.state.get(key)
+            self.seen.add(key)
+            if previous is None:
+                events.append({'t': t, 'e': 'add', 'k': key, 'n': current})
+            else:
+                events.extend({'t': t, 'e': name, 'k': key, 'o': previous.get(name), 'n': value}
+                              for name, value in current.items() if previous.get(name) != value)
+            self.state[key] = current
+        self.pending.extend(events)
+        return events
+
+    def finish(self, courses: Optional[Iterable[str]] = None, timestamp: Optional[str] = None) -> List[dict]:
+        """
+        Close a scrape of `courses`: emit removals for their unseen sections and save state.
+
+        Pass every course whose listing loaded, including ones that came back
+        empty, so a course whose sections all disappear reads as removals.
+        Sections of courses outside `courses` (default: the courses with at
+        least one observed section, for callers that can't tell which loads
+        failed) are left alone, so partial fetches, failed course loads and
+        single-course polls don't read as removals.
+        """
+        t = self._timestamp(timestamp)
+        covered = {_course(code) for code in (self.seen if courses is None else courses)}
+        gone = [key for key in self.state
+                if key not in self.seen and _course(key) in covered]
+        events = [{'t': t, 'e': 'remove', 'k': key, 'o': self.state.pop(key)} for key in gone]
+        self._append(self.pending + events)
+        self.pending = []
+        self.seen = {key for key in self.seen if _course(key) not in covered}
+        self._save()
+        return events
+
+    def emit(self, sections: List, courses: Optional[Iterable[str]] = None,
+             timestamp: Optional[str] = None) -> List[dict]:
+        """observe() + finish() for one complete scrape of `courses`"""
+        return self.observe(sections, timestamp) + self.finish(courses, timestamp)
+
+
+def tail(path, offset: int = 0, follow: bool = True,
+         poll_interval: float = TAIL_POLL_INTERVAL) -> Iterator[Tuple[int, dict]]:
+    """
+    Yield (next_offset, event) for each event in the stream from byte `offset` on.
+
+    With follow=True, waits for new lines instead of stopping at the end;
+    pass a returned offset back in to resume a subscriber where it left off.
+    A half-written last line is held back until it is complete.
+    """
+    path = Path(path)
+    while True:
+        if path.exists():
+            if path.stat().st_size < offset:
+                offset = 0  # stream was truncated or replaced
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    offset += len(line)
+                    try:
+                        yield offset, json.loads(line)
+                    except ValueError:
+                        continue
+        if not follow:
+            return
+        time.sleep(poll_interval)
+
+
+def subscribe(path, callback: Callable[[dict], None], types: Optional[Iterable[str]] = None,
+              offset: int = 0, follow: bool = True) -> int:
+    """Call `callback` for every event (optionally only `types`); returns the offset reached"""
+    wanted = set(types) if types else None
+    try:
+        for offset, event in tail(path, offset, follow):
+            if wanted is None or event.get('e') in wanted:
+                callback(event)
+    except KeyboardInterrupt:
+        pass
+    return offset
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Franklin Self-Service Catalog API Client
+
+Talks to the JSON endpoints behind Franklin University's Colleague
+Self-Service course search (the same requests the search page makes), so
+whole-term catalogs can be enumerated, and a course's section listing
+fetched, with plain HTTP instead of a browser.
+
+Author: Course Analytics Project
+Version: 1.0 (Catalog Discovery)
+"""
+
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from course_key import CourseIndex, course_key
+from scraping_runtime import RateLimiter
+
+SELF_SERVICE_URL = "https://selfservice.franklin.edu/Student"
+SEARCH_PATH = "/Courses/Search"
+CATALOG_OPTIONS_PATH = "/Courses/GetCatalogAdvancedSearchAsync"
+SEARCH_CRITERIA_PATH = "/Courses/PostSearchCriteria"
+# Request behind "View Available Sections": course id + matching section ids in,
+# sections grouped by term out
+SECTIONS_PATH = "/Courses/Sections"
+
+REQUEST_TIMEOUT = 30
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_WORKERS = 4
+SECTION_IDS_MAX_AGE = 1800  # seconds before a repeated poll re-searches for newly added sections
+SEARCH_INTERVAL = 1.0  # seconds between catalog searches across all discovery workers
+
+TOKEN_PATTERN = re.compile(r'name="__RequestVerificationToken"[^>]*value="([^"]+)"')
+USER_AGENT = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+
+class SelfServiceClient:
+    """Thread-safe client; each worker thread gets its own HTTP session"""
+
+    def __init__(self, base_url: str = SELF_SERVICE_URL, timeout: float = REQUEST_TIMEOUT):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._cookies: Dict[str, str] = {}
+        self._options: Optional[dict] = None
+        # (course id, matching section ids, monotonic time found) per course,
+        # filled by searches and discovery
+        self.courses: CourseIndex[Tuple[str, List[str], float]] = CourseIndex()
+
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            import requests
+            session = requests.Session()
+            session.headers.update({'User-Agent': USER_AGENT, 'Accept': 'application/json'})
+            self._prime(session)
+            self._local.session = session
+        return session
+
+    def _prime(self, session):
+        """Load the search page once for the antiforgery token and session cookies"""
+        with self._lock:
+            if self._token is None:
+                response = session.get(self.base_url + SEARCH_PATH, timeout=self.timeout)
+                response.raise_for_status()
+                match = TOKEN_PATTERN.search(response.text)
+                self._token = match.group(1) if match else ''
+                self._cookies = session.cookies.get_dict()
+            else:
+                session.cookies.update(self._cookies)
+        if self._token:
+            session.headers['__RequestVerificationToken'] = self._token
+
+    def get_json(self, path: str, params: Optional[dict] = None):
+        response = self._session().get(self.base_url + path, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def post_json(self, path: str, payload: dict):
+        response = self._session().post(self.base_url + path, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def catalog_options(self) -> dict:
+        """Subjects and terms offered by the catalog search (fetched once)"""
+        if self._options is None:
+            self._options = self.get_json(CATALOG_OPTIONS_PATH)
+        return self._options
+
+    def term_code(self, term_description: str) -> Optional[str]:
+        """'Spring 2026' -> Self-Service term code"""
+        for term in self.catalog_options().get('Terms', []):
+            if term.get('Description', '').strip().lower() == term_description.strip().lower():
+                return term.get('Code')
+        return None
+
+    def search(self, term_code: str, subjects: List[str], page: int = 1,
+               per_page: int = DEFAULT_PAGE_SIZE, keyword: Optional[str] = None) -> dict:
+        payload = {
+            'keyword': keyword,
+            'terms': [term_code] if term_code else [],
+            'subjects': subjects,
+            'requirement': None,
+            'subrequirement': None,
+            'courseIds': None,
+            'sectionIds': None,
+            'requirementText': None,
+            'subrequirementText': '',
+            'group': None,
+            'startTime': None,
+            'endTime': None,
+            'openSections': None,
+            'academicLevels': [],
+            'courseLevels': [],
+            'synonyms': [],
+            'courseTypes': [],
+            'topicCodes': [],
+            'days': [],
+            'locations': [],
+            'faculty': [],
+            'onlineCategories': None,
+            'keywordComponents': [],
+            'startDate': None,
+            'endDate': None,
+            'startsAtTime': None,
+            'endsByTime': None,
+            'pageNumber': page,
+            'sortOn': 'SectionName',
+            'sortDirection': 'Ascending',
+            'subjectsBadge': [],
+            'locationsBadge': [],
+            'termFiltersBadge': [],
+            'daysBadge': [],
+            'facultyBadge': [],
+            'academicLevelsBadge': [],
+            'courseLevelsBadge': [],
+            'courseTypesBadge': [],
+            'topicCodesBadge': [],
+            'onlineCategoriesBadge': [],
+            'openSectionsBadge': '',
+            'openAndWaitlistedSectionsBadge': '',
+            'subRequirementText': None,
+            'quantityPerPage': per_page,
+            'openAndWaitlistedSections': None,
+            'searchResultsView': 'CatalogListing',
+        }
+        result = self.post_json(SEARCH_CRITERIA_PATH, payload)
+        self.remember(result)
+        return result
+
+    def remember(self, result: dict):
+        """Index course ids and section ids from a search result for later section calls"""
+        now = time.monotonic()
+        for course in result.get('Courses', []):
+            code = course_code_of(course)
+            if code and course.get('Id'):
+                self.courses[code] = (course['Id'], list(course.get('MatchingSectionIds') or []), now)
+
+    def course_sections(self, code: str, term_code: Optional[str] = None,
+                        max_age: Optional[float] = None) -> Optional[dict]:
+        """
+        Section listing payload for one course, or None if the course isn't offered.
+
+        Courses seen by an earlier search (e.g. discovery) cost one request; others
+        take a keyword search first to learn the course id. The section ids come
+        from that search, so pass `max_age` (seconds) when polling repeatedly to
+        search again and pick up sections added since.
+        """
+        key = course_key(code)
+        if key is None:
+            return None
+        cached = self.courses.get(key)
+        if cached is None or (max_age is not None and time.monotonic() - cached[2] > max_age):
+            self.search(term_code, [], 1, DEFAULT_PAGE_SIZE, keyword=key.star)
+            if cached is not None and self.courses.get(key) is cached:
+                # Not found again: keep the known ids, and don't re-search on every poll
+                self.courses[key] = cached[:2] + (time.monotonic(),)
+        if key not in self.courses:
+            return None
+        course_id, section_ids, _ = self.courses[key]
+        return self.post_json(SECTIONS_PATH, {'courseId': course_id, 'sectionIds': section_ids})
+
+
+def course_code_of(course: dict) -> Optional[str]:
+    """Self-Service course record -> 'DATA 610'"""
+    subject = (course.get('SubjectCode') or '').strip()
+    number = (course.get('Number') or '').strip()
+    return f"{subject} {number}" if subject and number else None
+
+
+def discover_courses(client: SelfServiceClient, term: str, subjects: Optional[List[str]] = None,
+                     workers: int = DEFAULT_WORKERS, per_page: int = DEFAULT_PAGE_SIZE,
+                     rate_limiter: Optional[RateLimiter] = None) -> List[str]:
+    """Enumerate every course with sections in `term`, across all (or the given) subjects
+
+    Subjects are searched concurrently; for each subject the first page reports
+    the page count and the remaining pages are fetched in parallel too. Every
+    search waits on `rate_limiter`, so workers overlap latency without raising
+    the request rate. A subject or page whose search fails is logged and
+    skipped.
+    """
+    rate_limiter = rate_limiter or RateLimiter(SEARCH_INTERVAL)
+    term_code = client.term_code(term) if term else None
+    if term and not term_code:
+        print(f"⚠️  Term '{term}' not offered by catalog search, searching all terms")
+
+    if not subjects:
+        subjects = [s.get('Code') for s in client.catalog_options().get('Subjects', []) if s.get('Code')]
+    print(f"🔭 Discovering courses for {term or 'all terms'} across {len(subjects)} subjects...")
+
+    def fetch(subject: str, page: int) -> Optional[dict]:
+        rate_limiter.wait()
+        try:
+            return client.search(term_code, [subject], page, per_page)
+        except Exception as e:
+            print(f"⚠️  Catalog search failed for {subject} page {page}: {e}")
+            return None
+
+    found: Dict[str, None] = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        first_pages = [(subject, result)
+                       for subject, result in pool.map(lambda subject: (subject, fetch(subject, 1)), subjects)
+                       if result is not None]
+        remaining = [(subject, page)
+                     for subject, result in first_pages
+                     for page in range(2, int(result.get('TotalPages') or 1) + 1)]
+        later_pages = [result for result in pool.map(lambda item: fetch(*item), remaining) if result is not None]
+
+    failed = len(subjects) + len(remaining) - len(first_pages) - len(later_pages)
+    if failed:
+        print(f"⚠️  {failed} catalog page(s) failed; their courses are missing from discovery")
+    for result in [r for _, r in first_pages] + later_pages:
+        for course in result.get('Courses', []):
+            if term_code is None or course.get('MatchingSectionIds'):
+                code = course_code_of(course)
+                if code:
+                    found.setdefault(code, None)
+
+    courses = sorted(found)
+    print(f"✅ Discovered {len(courses)} courses ({len(first_pages) + len(later_pages)} catalog pages)")
+    return courses
@@ -0,0 +1,62 @@
+# Change events for courses that lose sections between fetches:
+# python -m unittest discover -s tests
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / 'scripts'))
+
+from scrape_franklin_courses import CourseRequest, FranklinCourseScraper, SectionFilter  # noqa: E402
+from section_events import EventStream  # noqa: E402
+
+PAYLOAD = json.loads((HERE / 'fixtures' / 'sections_payload.json').read_text(encoding='utf-8'))
+
+
+def scraper():
+    return FranklinCourseScraper(start_driver=False, section_filter=SectionFilter(session_patterns=[]))
+
+
+class NotOfferedClient:
+    """Self-Service stand-in whose searches succeed but never list the course"""
+
+    def term_code(self, term):
+        return '2026SP'
+
+    def course_sections(self, code, term_code=None):
+        return None
+
+
+class EventStreamRemovalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.stream = EventStream(Path(self.tmp.name) / 'events.jsonl')
+        self.sections = scraper().sections_from_payload(PAYLOAD, 'DATA*610', 'Spring 2026')
+        self.stream.emit(self.sections, ['DATA*610'])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_loaded_course_with_no_sections_removes_all(self):
+        events = self.stream.emit([], ['DATA*610'])
+        self.assertEqual(len(events), len(self.sections))
+        self.assertEqual({e['e'] for e in events}, {'remove'})
+        self.assertEqual({e['k'] for e in events}, {s.session_code for s in self.sections})
+        self.assertEqual(self.stream.state, {})
+
+    def test_unloaded_course_keeps_its_sections(self):
+        self.assertEqual(self.stream.emit([]), [])
+        self.assertEqual(len(self.stream.state), len(self.sections))
+
+
+class LoadedCoursesTest(unittest.TestCase):
+    def test_not_offered_course_counts_as_loaded(self):
+        direct = scraper()
+        direct.scrape_direct(CourseRequest('Spring 2026', [('DATA 610', False)]), NotOfferedClient())
+        self.assertEqual(direct.loaded_courses, ['DATA*610'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# Self-Service section-listing payload parsing against a sample response:
+# python -m unittest discover -s tests
+import json
+import sys
+import unittest
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent / 'scripts'))
+
+from scrape_franklin_courses import FranklinCourseScraper, SectionFilter  # noqa: E402
+
+PAYLOAD = json.loads((HERE / 'fixtures' / 'sections_payload.json').read_text(encoding='utf-8'))
+
+
+def scraper(**filters):
+    return FranklinCourseScraper(start_driver=False, section_filter=SectionFilter(**filters))
+
+
+class SectionsFromPayloadTest(unittest.TestCase):
+    def test_face_to_face_section_fields(self):
+        sections = scraper().sections_from_payload(PAYLOAD, 'DATA 610', 'Spring 2026')
+        self.assertEqual([s.session_code for s in sections], ['DATA*610-F1FF'])
+        section = sections[0]
+        self.assertEqual(section.course_code, 'DATA*610')
+        self.assertEqual(section.course_name, 'DATA-610 Applied Statistics')
+        self.assertEqual(section.credits, '4')
+        self.assertEqual((section.seats_available, section.seats_total, section.seats_waitlisted), ('2', '24', '3'))
+        self.assertEqual(section.weekdays, ['Tuesday', 'Thursday'])
+        self.assertEqual(section.class_times, ['6:00 PM - 8:00 PM'] * 2)
+        self.assertEqual(section.locations, ['Frasch Hall 414'])
+        self.assertEqual(section.instructors, ['Klingler, Michael'])
+        self.assertEqual(section.teaching_mode, 'Face-to-Face')
+        self.assertEqual((section.start_date, section.end_date), ('1/12/2026', '4/26/2026'))
+        self.assertEqual(section.term, 'Spring 2026')
+
+    def test_unfiltered_keeps_online_sections(self):
+        sections = scraper(session_patterns=[]).sections_from_payload(PAYLOAD, 'DATA*610', 'Spring 2026')
+        online = {s.session_code: s for s in sections}['DATA*610-W1']
+        self.assertEqual(online.teaching_mode, 'Online')
+        self.assertEqual(online.instructors, ['Aldajani, Fatima'])
+
+    def test_term_filter(self):
+        sections = scraper().sections_from_payload(PAYLOAD, 'DATA*610', 'Summer 2026')
+        self.assertEqual([s.session_code for s in sections], ['DATA*610-F2FF'])
+        self.assertEqual(sections[0].weekdays, ['Monday', 'Wednesday'])
+
+    def test_no_sections_is_an_empty_list(self):
+        payload = {'SectionsRetrieved': {'TermsAndSections': []}}
+        self.assertEqual(scraper().sections_from_payload(payload, 'DATA*610', 'Spring 2026'), [])
+
+    def test_unrecognized_payload_is_none(self):
+        broken_group = {'Term': {'Description': 'Spring 2026'}, 'Sections': ['x']}
+        for payload in ({'Sections': []}, {'SectionsRetrieved': {'TermsAndSections': [broken_group]}}, []):
+            self.assertIsNone(scraper().sections_from_payload(payload, 'DATA*610', 'Spring 2026'))
+
+    def test_archived_snapshot_replay(self):
+        sections = scraper().extract_sections('DATA*610', 'Spring 2026', json.dumps(PAYLOAD))
+        self.assertEqual([s.session_code for s in sections], ['DATA*610-F1FF'])
+        self.assertEqual(scraper().extract_sections('DATA*610', 'Spring 2026', '{"Sections": []}'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()